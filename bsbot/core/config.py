@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 import yaml
 
 
@@ -24,6 +24,8 @@ class Config:
 
         self.config_dir = Path(config_dir)
         self._cache: Dict[str, Any] = {}
+        # Profile listings keyed by sub-directory, valid while its files are unchanged.
+        self._listing_cache: Dict[str, Tuple[Tuple[Any, ...], List[Dict[str, Any]]]] = {}
 
     def load_profile(self) -> Dict[str, Any]:
         """Load profile configuration with environment overrides."""
@@ -45,28 +47,53 @@ class Config:
         """Load an interface profile by id."""
         return self._load_config(f"interfaces/{interface_id}.yml")
 
-    def list_monster_profiles(self) -> List[Dict[str, Any]]:
-        base = self.config_dir / "monsters"
-        if not base.exists():
+    def _cached_listing(self, subdir: str, build: Callable[[Path], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return ``build(base)`` for a profile directory, rebuilt only when its files change.
+
+        The directory mtime only moves when files are added or removed, so
+        each profile's (name, mtime_ns, size) is part of the key as well.
+        """
+        base = self.config_dir / subdir
+        try:
+            files = []
+            for path in base.glob("*.yml"):
+                st = path.stat()
+                files.append((path.name, st.st_mtime_ns, st.st_size))
+            signature = (base.stat().st_mtime_ns, tuple(sorted(files)))
+        except OSError:
             return []
-        out: List[Dict[str, Any]] = []
-        for path in sorted(base.glob("*.yml")):
-            data = self.load_monster_profile(path.stem) or {}
-            if data:
-                out.append({"id": data.get("id") or path.stem, "name": data.get("name")})
-            else:
-                out.append({"id": path.stem, "name": path.stem})
-        return out
+        cached = self._listing_cache.get(subdir)
+        if cached is None or cached[0] != signature:
+            # Profiles may have been edited in place; read them afresh.
+            prefix = str(base) + os.sep
+            for key in [k for k in self._cache if k.startswith(prefix)]:
+                del self._cache[key]
+            cached = (signature, build(base))
+            self._listing_cache[subdir] = cached
+        return list(cached[1])
+
+    def list_monster_profiles(self) -> List[Dict[str, Any]]:
+        def build(base: Path) -> List[Dict[str, Any]]:
+            out: List[Dict[str, Any]] = []
+            for path in sorted(base.glob("*.yml")):
+                data = self.load_monster_profile(path.stem) or {}
+                if data:
+                    out.append({"id": data.get("id") or path.stem, "name": data.get("name")})
+                else:
+                    out.append({"id": path.stem, "name": path.stem})
+            return out
+
+        return self._cached_listing("monsters", build)
 
     def list_interface_profiles(self) -> List[Dict[str, Any]]:
-        base = self.config_dir / "interfaces"
-        if not base.exists():
-            return []
-        out: List[Dict[str, Any]] = []
-        for path in sorted(base.glob("*.yml")):
-            data = self.load_interface_profile(path.stem) or {}
-            out.append({"id": data.get("id") or path.stem, "name": data.get("name")})
-        return out
+        def build(base: Path) -> List[Dict[str, Any]]:
+            out: List[Dict[str, Any]] = []
+            for path in sorted(base.glob("*.yml")):
+                data = self.load_interface_profile(path.stem) or {}
+                out.append({"id": data.get("id") or path.stem, "name": data.get("name")})
+            return out
+
+        return self._cached_listing("interfaces", build)
 
     def _interactable_path(self, interactable_id: str) -> Path:
         return self.config_dir / "interactables" / f"{interactable_id}.yml"
@@ -207,6 +234,7 @@ class Config:
     def clear_cache(self):
         """Clear the configuration cache."""
         self._cache.clear()
+        self._listing_cache.clear()
 
 
 # Global config instance
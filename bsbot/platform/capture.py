@@ -1,15 +1,181 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Optional, Tuple
+import ctypes
+import os
+import sys
+import threading
+
+import cv2
 import mss
 import numpy as np
 
 
-def grab_rect(x: int, y: int, w: int, h: int) -> np.ndarray:
-    with mss.mss() as sct:
-        monitor = {"left": x, "top": y, "width": w, "height": h}
-        img = sct.grab(monitor)
-        # mss returns BGRA; convert to BGR numpy array
-        arr = np.asarray(img)[:, :, :3]
-        return arr.copy()
+# mss instances hold a device context and bitmap and must stay on the thread
+# that created them, so each capturing thread keeps its own for reuse.
+_local = threading.local()
+
+# BSBOT_CAPTURE=gdi grabs with a persistent BitBlt target instead of mss
+# (Windows only). mss remains the default.
+_USE_GDI = sys.platform == "win32" and os.environ.get("BSBOT_CAPTURE", "mss").lower() == "gdi"
+
+
+def _sct() -> "mss.base.MSSBase":
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        sct = _local.sct = mss.mss()
+    return sct
+
+
+class _GdiGrabber:
+    """Screen-to-DIB BitBlt with the DCs and DIB section kept between calls.
+
+    The DIB section is recreated only when the capture size changes. Like the
+    mss instances, a grabber belongs to the thread that created it.
+    """
+
+    _SRCCOPY = 0x00CC0020
+    _CAPTUREBLT = 0x40000000
+
+    def __init__(self) -> None:
+        from ctypes import wintypes
+
+        class BITMAPINFOHEADER(ctypes.Structure):
+            _fields_ = [
+                ("biSize", wintypes.DWORD),
+                ("biWidth", ctypes.c_long),
+                ("biHeight", ctypes.c_long),
+                ("biPlanes", wintypes.WORD),
+                ("biBitCount", wintypes.WORD),
+                ("biCompression", wintypes.DWORD),
+                ("biSizeImage", wintypes.DWORD),
+                ("biXPelsPerMeter", ctypes.c_long),
+                ("biYPelsPerMeter", ctypes.c_long),
+                ("biClrUsed", wintypes.DWORD),
+                ("biClrImportant", wintypes.DWORD),
+            ]
 
+        self._header_type = BITMAPINFOHEADER
+        self._user32 = ctypes.windll.user32
+        self._gdi32 = ctypes.windll.gdi32
+        # Handles are pointer-sized; without argtypes ctypes would pass them
+        # as C ints and truncate them on 64-bit Python.
+        user32, gdi32 = self._user32, self._gdi32
+        user32.GetDC.argtypes = [wintypes.HWND]
+        user32.GetDC.restype = wintypes.HDC
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        user32.ReleaseDC.restype = ctypes.c_int
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+        gdi32.DeleteDC.restype = wintypes.BOOL
+        gdi32.CreateDIBSection.argtypes = [
+            wintypes.HDC, ctypes.POINTER(BITMAPINFOHEADER), wintypes.UINT,
+            ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD,
+        ]
+        gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteObject.restype = wintypes.BOOL
+        gdi32.BitBlt.argtypes = [
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+        ]
+        gdi32.BitBlt.restype = wintypes.BOOL
+        gdi32.GdiFlush.argtypes = []
+        gdi32.GdiFlush.restype = wintypes.BOOL
+        self._screen_dc = user32.GetDC(None)
+        self._mem_dc = gdi32.CreateCompatibleDC(self._screen_dc) if self._screen_dc else None
+        self._bitmap = None
+        self._default_bitmap = None
+        self._pixels: Optional[np.ndarray] = None
+        self._size: Tuple[int, int] = (0, 0)
+        if not self._screen_dc or not self._mem_dc:
+            self.close()
+            raise OSError("GDI capture: could not create device contexts")
+
+    def _ensure_bitmap(self, w: int, h: int) -> np.ndarray:
+        if self._pixels is not None and self._size == (w, h):
+            return self._pixels
+        header = self._header_type()
+        header.biSize = ctypes.sizeof(header)
+        header.biWidth = w
+        header.biHeight = -h  # top-down rows, matching numpy layout
+        header.biPlanes = 1
+        header.biBitCount = 32
+        bits = ctypes.c_void_p()
+        bitmap = self._gdi32.CreateDIBSection(self._mem_dc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+        if not bitmap or not bits.value:
+            raise OSError("GDI capture: CreateDIBSection failed")
+        previous = self._gdi32.SelectObject(self._mem_dc, bitmap)
+        if self._default_bitmap is None:
+            self._default_bitmap = previous
+        if self._bitmap:
+            self._gdi32.DeleteObject(self._bitmap)
+        self._bitmap = bitmap
+        buf = (ctypes.c_ubyte * (w * h * 4)).from_address(bits.value)
+        self._pixels = np.ctypeslib.as_array(buf).reshape(h, w, 4)
+        self._size = (w, h)
+        return self._pixels
+
+    def grab(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        pixels = self._ensure_bitmap(w, h)
+        if not self._gdi32.BitBlt(self._mem_dc, 0, 0, w, h, self._screen_dc, x, y, self._SRCCOPY | self._CAPTUREBLT):
+            raise OSError("GDI capture: BitBlt failed")
+        self._gdi32.GdiFlush()
+        # The DIB memory is reused next call; cvtColor writes a new frame.
+        return cv2.cvtColor(pixels, cv2.COLOR_BGRA2BGR)
+
+    def close(self) -> None:
+        """Release the DIB section and both device contexts."""
+        if self._mem_dc:
+            if self._default_bitmap:
+                self._gdi32.SelectObject(self._mem_dc, self._default_bitmap)
+            self._gdi32.DeleteDC(self._mem_dc)
+            self._mem_dc = None
+        if self._bitmap:
+            self._gdi32.DeleteObject(self._bitmap)
+            self._bitmap = None
+        self._pixels = None
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, self._screen_dc)
+            self._screen_dc = None
+
+    def __del__(self) -> None:
+        # Runs when the owning thread exits and its thread-local goes away.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _gdi() -> _GdiGrabber:
+    grabber = getattr(_local, "gdi", None)
+    if grabber is None:
+        grabber = _local.gdi = _GdiGrabber()
+    return grabber
+
+
+def close() -> None:
+    """Release the calling thread's mss instance and GDI grabber, if any."""
+    sct = getattr(_local, "sct", None)
+    if sct is not None:
+        _local.sct = None
+        sct.close()
+    grabber = getattr(_local, "gdi", None)
+    if grabber is not None:
+        _local.gdi = None
+        grabber.close()
+
+
+def grab_rect(x: int, y: int, w: int, h: int) -> np.ndarray:
+    if _USE_GDI:
+        return _gdi().grab(x, y, w, h)
+    monitor = {"left": x, "top": y, "width": w, "height": h}
+    img = _sct().grab(monitor)
+    # mss returns BGRA; np.asarray wraps its buffer without copying and one
+    # SIMD cvtColor pass writes the BGR frame. Each call returns a new array:
+    # frames are kept for previews and keyed by identity in detector caches,
+    # so a shared output buffer would be overwritten under them.
+    return cv2.cvtColor(np.asarray(img), cv2.COLOR_BGRA2BGR)
@@ -29,6 +29,18 @@ def find_window_exact(title: str) -> int | None:
     return None
 
 
+def pin_current_thread_to_cpu(cpu_index: int) -> None:
+    kernel32.GetCurrentThread.restype = wintypes.HANDLE
+    kernel32.SetThreadAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+    kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+    if not kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << cpu_index):
+        raise OSError(f"SetThreadAffinityMask failed for CPU {cpu_index}")
+
+
+def is_window(hwnd: int) -> bool:
+    return bool(hwnd) and bool(user32.IsWindow(hwnd))
+
+
 def get_client_rect(hwnd: int) -> tuple[int, int, int, int]:
     rect = RECT()
     if not user32.GetClientRect(hwnd, ctypes.byref(rect)):
@@ -32,6 +32,21 @@ from bsbot.navigation import (
     MinimapSettings,
 )
 from bsbot.calibration import CalibrationManager
+from bsbot.vision.preview import encode_jpeg
+from bsbot.vision.detect import configure_opencv, configure_tesseract, warm_up_ocr
+
+
+# Queued to the preview worker to make it exit.
+_PREVIEW_STOP = object()
+
+
+def _json_default(value: Any) -> Any:
+    """JSON form of numpy scalars/arrays and sets in detection results."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 @dataclass
@@ -40,6 +55,7 @@ class DetectionStatus:
     paused: bool = False
     last_result: dict = field(default_factory=dict)
     last_frame: Optional[bytes] = None  # JPEG bytes for preview
+    last_frame_seq: int = 0  # bumped whenever last_frame changes
     template_path: Optional[str] = None
     template_source: Optional[str] = None
     title: str = "Brighter Shores"
@@ -85,6 +101,7 @@ class DetectionStatus:
 class DetectorRuntime:
     def __init__(self) -> None:
         self.logger = init_logging(level=os.environ.get("LOG_LEVEL", "INFO"))
+        configure_opencv()
         self.status = DetectionStatus()
         profile = load_profile() or {}
         self.status.title = profile.get("window_title", self.status.title)
@@ -153,6 +170,19 @@ class DetectorRuntime:
         self._thread: Optional[threading.Thread] = None
         self._stop_evt = threading.Event()
         self._lock = threading.Lock()
+        # Skills render a preview only until this monotonic time; UI polls push it out.
+        self._preview_deadline = 0.0
+        # (jpeg, seq) swapped as one reference so readers need no lock
+        self._preview: Tuple[Optional[bytes], int] = (None, 0)
+        # status.last_result as JSON, encoded once per frame by the loop.
+        self._last_result_json = "{}"
+        # Signalled under self._lock whenever a new preview is published
+        self._preview_ready = threading.Condition(self._lock)
+        # Annotated images waiting for the preview encoder thread; only the
+        # newest is kept, so a slow encode drops frames instead of lagging.
+        self._preview_cv = threading.Condition()
+        self._preview_pending: Optional[Any] = None
+        self._preview_thread: Optional[threading.Thread] = None
         # State/timeline
         self._state = "Scan"
         self._phase = self.status.phase
@@ -162,6 +192,7 @@ class DetectorRuntime:
         self._skill_name: str = "combat"
         # Input helpers
         self._active_hwnd: Optional[int] = None
+        self._hwnd_cache: Tuple[Optional[str], Optional[int]] = (None, None)
         self._last_live_click: dict[str, float] = {}
         self._click_cooldown = 0.45
         self._click_jitter_px = 5
@@ -174,6 +205,12 @@ class DetectorRuntime:
             self._loop_sleep = float(env_loop) if env_loop else default_loop_sleep
         except (TypeError, ValueError):
             self._loop_sleep = default_loop_sleep
+        # Optional fixed cadence: wait only for what is left of this period
+        # after each iteration (0 keeps the fixed BSBOT_LOOP_SLEEP pause).
+        try:
+            self._loop_period = max(0.0, float(os.environ.get("BSBOT_LOOP_PERIOD") or 0.0))
+        except (TypeError, ValueError):
+            self._loop_period = 0.0
         self._register_default_skills()
         compass_settings = CompassSettings(
             roi=self.status.compass_roi,
@@ -199,6 +236,8 @@ class DetectorRuntime:
         self._records_path = Path(os.environ.get("BSBOT_INTERACTABLE_RECORDS", "logs/interactable_positions.json"))
         self._load_interactable_records()
         self._roi_config = {"pixels": None, "reference": None}
+        self._roi_cache_key: Optional[Tuple[Any, ...]] = None
+        self._roi_cache_val: Optional[Tuple[int, int, int, int]] = None
         self._configure_initial_roi(profile)
         self.calibration = CalibrationManager(
             self,
@@ -447,22 +486,46 @@ class DetectorRuntime:
             except Exception:
                 self.logger.exception("skill on_stop failed")
             self.logger.info("Runtime stopped")
+        # Outside the lock: the preview worker takes it to publish.
+        self._stop_preview_worker()
         if hasattr(self, "calibration"):
             self.calibration.shutdown()
 
     def _run_loop(self) -> None:
         win.make_dpi_aware()
+        # Opt-in: keep capture and detection on one core (e.g. a P-core on
+        # hybrid CPUs) instead of wherever the scheduler puts them.
+        detect_cpu = os.environ.get("BSBOT_DETECT_CPU")
+        if detect_cpu:
+            try:
+                win.pin_current_thread_to_cpu(int(detect_cpu))
+            except Exception as exc:
+                self.logger.warning("could not pin detection thread to CPU %s: %s", detect_cpu, exc)
+        # Pay the OCR engine's first-call cost before the first frame does.
+        if self.status.method in {"auto", "ocr"}:
+            configure_tesseract(self.status.tesseract_path)
+            warm_up_ocr()
+        try:
+            self._capture_loop()
+        finally:
+            # mss/GDI capture handles belong to this thread; release them so
+            # start/stop cycles do not leak device contexts.
+            capture.close()
+
+    def _capture_loop(self) -> None:
+        # Waits go through the stop event so stop() never waits out a pause.
         while not self._stop_evt.is_set():
+            started = time.perf_counter()
             if self.status.paused:
-                time.sleep(0.1)
+                self._stop_evt.wait(0.1)
                 continue
             try:
                 self._active_hwnd = None
-                hwnd = win.find_window_exact(self.status.title)
+                hwnd = self._resolve_hwnd(self.status.title)
                 if not hwnd:
                     msg = {"error": f"Window not found: {self.status.title}"}
                     self._set_result(msg, frame=None)
-                    time.sleep(0.5)
+                    self._stop_evt.wait(0.5)
                     continue
                 x, y, w, h = win.get_client_rect(hwnd)
                 self._active_hwnd = hwnd
@@ -486,11 +549,35 @@ class DetectorRuntime:
             except Exception as e:
                 self._set_result({"error": str(e)}, frame=None)
                 self.logger.exception("runtime error")
-            time.sleep(self._loop_sleep)
+            if self._loop_period > 0:
+                self._stop_evt.wait(max(0.0, self._loop_period - (time.perf_counter() - started)))
+            else:
+                self._stop_evt.wait(self._loop_sleep)
+
+    def _resolve_hwnd(self, title: str) -> Optional[int]:
+        """Window handle for ``title``, looked up again only once it stops being valid."""
+        cached_title, hwnd = self._hwnd_cache
+        if hwnd and cached_title == title and win.is_window(hwnd):
+            return hwnd
+        hwnd = win.find_window_exact(title)
+        self._hwnd_cache = (title, hwnd)
+        return hwnd
 
     def _roi_pixels(self, x: int, y: int, w: int, h: int) -> Tuple[int, int, int, int]:
         config_pixels = self._roi_config.get("pixels") if hasattr(self, "_roi_config") else None
         reference = self._roi_config.get("reference") if hasattr(self, "_roi_config") else None
+        # The window rarely moves and the ROI rarely changes: reuse the last
+        # rect while every input is equal. The key is taken after computing,
+        # since the pixel path rewrites status.roi.
+        key = (x, y, w, h, self.status.roi, config_pixels, reference)
+        if key == getattr(self, "_roi_cache_key", None) and self._roi_cache_val is not None:
+            return self._roi_cache_val
+        rect = self._compute_roi_pixels(x, y, w, h, config_pixels, reference)
+        self._roi_cache_key = (x, y, w, h, self.status.roi, config_pixels, reference)
+        self._roi_cache_val = rect
+        return rect
+
+    def _compute_roi_pixels(self, x: int, y: int, w: int, h: int, config_pixels, reference) -> Tuple[int, int, int, int]:
 
         if config_pixels and reference and reference[0] > 0 and reference[1] > 0:
             px, py, pw, ph = config_pixels
@@ -531,11 +618,86 @@ class DetectorRuntime:
         self.status.roi_px = (rel_x, rel_y, width_px, height_px)
         return abs_x, abs_y, width_px, height_px
 
-    def _set_result(self, result: dict, frame: Optional[bytes]) -> None:
+    def _set_result(self, result: dict, frame: Optional[Any]) -> None:
+        """Publish a frame's result and preview.
+
+        ``frame`` is JPEG bytes, or an annotated BGR image that the preview
+        thread encodes while detection moves on to the next frame.
+        """
+        if frame is not None and not isinstance(frame, (bytes, bytearray)):
+            self._queue_preview(frame)
+            frame = None
+        # Encoded here, outside the lock, so status polls only splice it in.
+        encoded = json.dumps(result, default=_json_default)
         with self._lock:
             self.status.last_result = result
+            self._last_result_json = encoded
             if frame is not None:
-                self.status.last_frame = frame
+                self._publish_preview(frame)
+
+    def _publish_preview(self, jpeg: bytes) -> None:
+        # Caller holds self._lock.
+        self.status.last_frame = jpeg
+        self.status.last_frame_seq += 1
+        self._preview = (jpeg, self.status.last_frame_seq)
+        self._preview_ready.notify_all()
+
+    def _queue_preview(self, image: Any) -> None:
+        with self._preview_cv:
+            if self._stop_evt.is_set():
+                return  # stopping; a late frame must not respawn the worker
+            self._preview_pending = image
+            if self._preview_thread is None:
+                self._preview_thread = threading.Thread(target=self._preview_worker, name="bsbot-preview", daemon=True)
+                self._preview_thread.start()
+            self._preview_cv.notify()
+
+    def _stop_preview_worker(self) -> None:
+        with self._preview_cv:
+            thread, self._preview_thread = self._preview_thread, None
+            self._preview_pending = _PREVIEW_STOP if thread is not None else None
+            self._preview_cv.notify()
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _preview_worker(self) -> None:
+        while True:
+            with self._preview_cv:
+                while self._preview_pending is None:
+                    self._preview_cv.wait()
+                image, self._preview_pending = self._preview_pending, None
+            if image is _PREVIEW_STOP:
+                return
+            jpeg = encode_jpeg(image, quality=70)
+            if jpeg is not None:
+                with self._lock:
+                    self._publish_preview(jpeg)
+
+    def latest_preview(self) -> Tuple[Optional[bytes], int]:
+        """Latest preview JPEG and its sequence number, read without the lock."""
+        return self._preview
+
+    def latest_result_json(self) -> str:
+        """``status.last_result`` as a JSON document, read without the lock."""
+        return self._last_result_json
+
+    def wait_for_preview(self, after_seq: int, timeout: float) -> Tuple[Optional[bytes], int]:
+        """Block until a preview newer than ``after_seq`` is published or ``timeout`` passes."""
+        with self._preview_ready:
+            self._preview_ready.wait_for(lambda: self._preview[1] != after_seq, timeout)
+            return self._preview
+
+    # A UI polls status about every 500 ms; a preview is still worth drawing
+    # for this long after the last poll.
+    _PREVIEW_GRACE_S = 2.0
+
+    def note_preview_request(self) -> None:
+        """Record that a client is watching, so skills keep rendering previews."""
+        self._preview_deadline = time.monotonic() + self._PREVIEW_GRACE_S
+
+    def preview_wanted(self) -> bool:
+        """Whether a client has polled recently enough for a preview to be seen."""
+        return time.monotonic() <= self._preview_deadline
 
     def snapshot(self) -> DetectionStatus:
         with self._lock:
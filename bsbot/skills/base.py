@@ -45,6 +45,10 @@ class SkillController(ABC):
 
     # Frame processing ----------------------------------------------------
     @abstractmethod
-    def process_frame(self, frame, ctx: FrameContext) -> Tuple[Dict[str, Any], Optional[bytes]]:
-        """Process the captured frame and return status + optional preview."""
+    def process_frame(self, frame, ctx: FrameContext) -> Tuple[Dict[str, Any], Optional[Any]]:
+        """Process the captured frame and return status + optional preview.
+
+        The preview is JPEG bytes, or an annotated BGR image the runtime
+        encodes on its preview thread.
+        """
         raise NotImplementedError
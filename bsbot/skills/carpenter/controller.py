@@ -14,6 +14,8 @@ from bsbot.vision.detect import (
     detect_template_multi,
     detect_word_ocr_multi,
 )
+from bsbot.vision.preview import encode_jpeg
+from bsbot.vision.templates import load_template
 
 
 @dataclass
@@ -127,7 +129,9 @@ class CarpenterController(SkillController):
 
         now = time.time()
         result = {}
-        annotated = frame.copy()
+        # No drawing or encoding while no UI is polling the preview. The
+        # annotations go on the frame itself, after the workflow has read it.
+        annotated = frame if self.runtime.preview_wanted() else None
 
         # Main carpenter workflow state machine
         if self._state == "bank_withdrawal":
@@ -142,7 +146,8 @@ class CarpenterController(SkillController):
             result = self._deposit_coins_to_bank(frame)
 
         # Add visual annotations
-        self._add_visual_annotations(annotated, result)
+        if annotated is not None:
+            self._add_visual_annotations(annotated, result)
 
         # Log state changes
         if now - self._last_log_ts > 2.0:
@@ -152,7 +157,7 @@ class CarpenterController(SkillController):
             )
             self._last_log_ts = now
 
-        return result, self._frame_to_jpeg(annotated)
+        return result, self._frame_to_jpeg(annotated) if annotated is not None else None
 
     def _withdraw_logs_from_bank(self, frame) -> Dict[str, object]:
         """Withdraw logs from the Lumber Bank."""
@@ -296,7 +301,7 @@ class CarpenterController(SkillController):
         template_path = self.templates.get(station)
         if template_path:
             try:
-                template = cv2.imread(template_path)
+                template = load_template(template_path)
                 if template is not None:
                     boxes, scores = detect_template_multi(frame, template, threshold=0.8)
                     if boxes:
@@ -319,7 +324,7 @@ class CarpenterController(SkillController):
         use_item_template = self.templates.get("use_item_on")
         if use_item_template:
             try:
-                template = cv2.imread(use_item_template)
+                template = load_template(use_item_template)
                 if template is not None:
                     boxes, scores = detect_template_multi(frame, template, threshold=0.8)
                     if boxes:
@@ -384,7 +389,7 @@ class CarpenterController(SkillController):
         trade_template = self.templates.get("trade")
         if trade_template:
             try:
-                template = cv2.imread(trade_template)
+                template = load_template(trade_template)
                 if template is not None:
                     boxes, scores = detect_template_multi(frame, template, threshold=0.8)
                     if boxes:
@@ -450,12 +455,9 @@ class CarpenterController(SkillController):
     def _frame_to_jpeg(self, frame) -> Optional[bytes]:
         """Convert frame to JPEG bytes for preview."""
         try:
-            success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            if success:
-                return buffer.tobytes()
+            return encode_jpeg(frame, quality=80)
         except Exception:
-            pass
-        return None
+            return None
         """Withdraw logs from the Lumber Bank."""
         result = {"state": "bank_withdrawal", "logs_withdrawn": False}
 
@@ -509,7 +511,7 @@ class CarpenterController(SkillController):
 
         # Look for crafting button or interaction
         if self.crafting_button_template:
-            boxes, scores = detect_template_multi(frame, cv2.imread(self.crafting_button_template))
+            boxes, scores = detect_template_multi(frame, load_template(self.crafting_button_template))
             if boxes:
                 # Click the crafting button
                 x, y, w, h = boxes[0]
@@ -579,7 +581,7 @@ class CarpenterController(SkillController):
 
         # Look for collect button
         if self.collect_button_template:
-            boxes, scores = detect_template_multi(frame, cv2.imread(self.collect_button_template))
+            boxes, scores = detect_template_multi(frame, load_template(self.collect_button_template))
             if boxes:
                 x, y, w, h = boxes[0]
                 center_x, center_y = x + w // 2, y + h // 2
@@ -623,7 +625,7 @@ class CarpenterController(SkillController):
         # Try template first
         if item.template_path:
             try:
-                template = cv2.imread(item.template_path)
+                template = load_template(item.template_path)
                 if template is not None:
                     boxes, scores = detect_template_multi(frame, template)
                     if boxes:
@@ -678,9 +680,6 @@ class CarpenterController(SkillController):
     def _frame_to_jpeg(self, frame) -> Optional[bytes]:
         """Convert frame to JPEG bytes for preview."""
         try:
-            success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            if success:
-                return buffer.tobytes()
+            return encode_jpeg(frame, quality=80)
         except Exception:
-            pass
-        return None
+            return None
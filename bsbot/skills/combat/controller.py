@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import threading
 import time
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from difflib import SequenceMatcher
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 import cv2
@@ -14,12 +17,15 @@ from bsbot.skills.base import FrameContext, SkillController
 from bsbot.core.config import load_monster_profile, load_interface_profile
 from bsbot.tracking import TileGrid, TileTracker
 from bsbot.vision.detect import (
+    clear_ocr_cache,
     configure_tesseract,
     detect_digits_ocr_multi,
     detect_template_multi,
     detect_word_ocr_multi,
+    detect_words_ocr_multi,
     derive_hitbox_from_word,
 )
+from bsbot.vision.templates import load_template
 
 
 @dataclass
@@ -90,6 +96,66 @@ PHASE_TRANSITION_OVERRIDES: Dict[Tuple[str, str], str] = {
 # Default ROIs for template matching (normalized x, y, w, h relative to frame).
 NAMEPLATE_TEMPLATE_ROI: Tuple[float, float, float, float] = (0.35, 0.15, 0.32, 0.20)
 ATTACK_TEMPLATE_ROI: Tuple[float, float, float, float] = (0.22, 0.10, 0.40, 0.24)
+# Attack panel HUD band (normalized x, y, w, h), used when the calibrated
+# attack ROI is empty.
+ATTACK_PANEL_FALLBACK_ROI: Tuple[float, float, float, float] = (0.55, 0.20, 0.40, 0.60)
+
+
+@lru_cache(maxsize=32)
+def _roi_pixel_rect(width: int, height: int, rel: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
+    """Pixel rect of a normalized ROI, clamped inside the frame.
+
+    Cached: the same few ROIs are converted for the same window size every
+    frame.
+    """
+    rx, ry, rw, rh = rel
+    x = int(round(rx * width))
+    y = int(round(ry * height))
+    w_px = max(1, int(round(rw * width)))
+    h_px = max(1, int(round(rh * height)))
+    if x < 0:
+        x = 0
+    if y < 0:
+        y = 0
+    if x >= width:
+        x = width - 1
+    if y >= height:
+        y = height - 1
+    if x + w_px > width:
+        w_px = max(1, width - x)
+    if y + h_px > height:
+        h_px = max(1, height - y)
+    return x, y, w_px, h_px
+
+
+def _draw_boxes(img: np.ndarray, boxes, color: Tuple[int, int, int], thickness: int) -> None:
+    """Outline (x, y, w, h) boxes with one ``cv2.polylines`` call.
+
+    Draws the same closed outline ``cv2.rectangle`` does for each box.
+    """
+    if not boxes:
+        return
+    b = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+    x0, y0 = b[:, 0], b[:, 1]
+    x1, y1 = x0 + b[:, 2], y0 + b[:, 3]
+    pts = np.stack([x0, y0, x1, y0, x1, y1, x0, y1], axis=1).reshape(-1, 4, 1, 2)
+    cv2.polylines(img, list(pts), True, color, thickness)
+
+
+# Independent lookups run here alongside the detection thread (OpenCV and
+# Tesseract release the GIL): the nameplate OCR next to the template search,
+# and the attack-panel OCR fallback next to the context-menu OCR, cancelled
+# if an earlier source finds the button.
+_detect_pool: Optional[ThreadPoolExecutor] = None
+_detect_pool_lock = threading.Lock()
+
+
+def _detect_executor() -> ThreadPoolExecutor:
+    global _detect_pool
+    with _detect_pool_lock:
+        if _detect_pool is None:
+            _detect_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bsbot-combat-detect")
+        return _detect_pool
 
 
 class CombatController(SkillController):
@@ -142,7 +208,9 @@ class CombatController(SkillController):
         self.attack_template = None
         self._template_threshold = 0.78
         self._attack_template_threshold = 0.78
+        self._template_downscale = 1
         self.attack_template_path: Optional[str] = None
+        self._ocr_oem: Optional[int] = None
 
     # ------------------------------------------------------------------
     def on_start(self, params: Dict[str, object] | None = None) -> None:
@@ -178,6 +246,9 @@ class CombatController(SkillController):
         self._last_tracked_tile = None
         self._hover_state.reset()
         self._floating_confidence = 0.0
+        # Cached OCR results are keyed by pixel content and never go stale,
+        # but a stopped session has no use for them.
+        clear_ocr_cache()
 
     def on_update_params(self, params: Dict[str, object] | None = None) -> None:
         if params:
@@ -236,9 +307,19 @@ class CombatController(SkillController):
                 self._attack_template_threshold = float(attack_thresh)
             except (TypeError, ValueError):
                 self._attack_template_threshold = 0.78
+        downscale = monster_profile.get("template_downscale", interface_profile.get("template_downscale"))
+        try:
+            self._template_downscale = max(1, int(downscale)) if downscale is not None else 1
+        except (TypeError, ValueError):
+            self._template_downscale = 1
+        ocr_oem = monster_profile.get("ocr_oem", interface_profile.get("ocr_oem"))
+        try:
+            self._ocr_oem = int(ocr_oem) if ocr_oem is not None else None
+        except (TypeError, ValueError):
+            self._ocr_oem = None
         if attack_template:
             try:
-                self.attack_template = cv2.imread(attack_template, cv2.IMREAD_COLOR)
+                self.attack_template = load_template(attack_template)
             except Exception:
                 self.attack_template = None
         else:
@@ -287,7 +368,7 @@ class CombatController(SkillController):
         self.current_phase = phase
         self.runtime.set_phase(phase)
 
-    def process_frame(self, frame, ctx: FrameContext) -> Tuple[Dict[str, object], Optional[bytes]]:
+    def process_frame(self, frame, ctx: FrameContext) -> Tuple[Dict[str, object], Optional[np.ndarray]]:
         status = self.runtime.status
         if status.method in {"auto", "ocr"}:
             configure_tesseract(status.tesseract_path)
@@ -305,9 +386,16 @@ class CombatController(SkillController):
         best_conf = 0.0
         method = status.method
 
+        # The prefix always needs OCR; with a template to try, start that OCR
+        # (plus the nameplate word for the fallback) while the template runs.
+        ocr_job: Optional[Future] = None
+        if self.prefix_word and method in {"auto", "template"} and status.template_path:
+            early_targets = ([self.word] if method == "auto" else []) + [self.prefix_word]
+            ocr_job = _detect_executor().submit(detect_words_ocr_multi, frame, early_targets, self._ocr_oem)
+
         # Template first
         if method in {"auto", "template"} and status.template_path:
-            tpl = cv2.imread(status.template_path, cv2.IMREAD_COLOR)
+            tpl = load_template(status.template_path)
             if tpl is not None:
                 tpl_boxes = []
                 scores: List[float] = []
@@ -316,14 +404,17 @@ class CombatController(SkillController):
                     nameplate_roi = calibration.get_roi("nameplate", NAMEPLATE_TEMPLATE_ROI)
                 nx, ny, nw, nh = self._roi_pixels(frame_w, frame_h, nameplate_roi)
                 if nw >= tpl.shape[1] and nh >= tpl.shape[0]:
-                    roi_view = frame[ny : ny + nh, nx : nx + nw]
-                    tpl_boxes, scores = detect_template_multi(roi_view, tpl, threshold=self._template_threshold)
-                    tpl_boxes = [
-                        (bx + nx, by + ny, bw, bh)
-                        for (bx, by, bw, bh) in tpl_boxes
-                    ]
+                    tpl_boxes, scores = detect_template_multi(
+                        frame,
+                        tpl,
+                        threshold=self._template_threshold,
+                        roi_xywh=(nx, ny, nw, nh),
+                        match_downscale=self._template_downscale,
+                    )
                 if not tpl_boxes:
-                    tpl_boxes, scores = detect_template_multi(frame, tpl, threshold=self._template_threshold)
+                    tpl_boxes, scores = detect_template_multi(
+                        frame, tpl, threshold=self._template_threshold, match_downscale=self._template_downscale
+                    )
                 if tpl_boxes:
                     boxes = tpl_boxes
                     best_conf = max(scores) if scores else 0.0
@@ -335,9 +426,17 @@ class CombatController(SkillController):
                             roi=nameplate_roi,
                             box=tpl_boxes[0] if tpl_boxes else None,
                         )
-        # OCR fallback
-        if not boxes and method in {"auto", "ocr", "template_fallback"}:
-            ocr_boxes, ocr_conf = detect_word_ocr_multi(frame, target=self.word)
+        # OCR fallback; the nameplate word and the prefix share one OCR run
+        ocr_fallback = not boxes and method in {"auto", "ocr", "template_fallback"}
+        ocr_targets = ([self.word] if ocr_fallback else []) + ([self.prefix_word] if self.prefix_word else [])
+        ocr_hits: Dict[str, Tuple[List[Tuple[int, int, int, int]], float]] = {}
+        if ocr_job is not None:
+            ocr_hits = ocr_job.result()
+        missing = [t for t in ocr_targets if t not in ocr_hits]
+        if missing:
+            ocr_hits.update(detect_words_ocr_multi(frame, missing, oem=self._ocr_oem))
+        if ocr_fallback:
+            ocr_boxes, ocr_conf = ocr_hits[self.word]
             if ocr_boxes:
                 boxes = ocr_boxes
                 method = "ocr"
@@ -367,7 +466,7 @@ class CombatController(SkillController):
         prefix_boxes: List[Tuple[int, int, int, int]] = []
         prefix_conf = 0.0
         if self.prefix_word:
-            prefix_boxes, prefix_conf = detect_word_ocr_multi(frame, target=self.prefix_word)
+            prefix_boxes, prefix_conf = ocr_hits[self.prefix_word]
 
         # Focused HUD regions ------------------------------------------------
         attack_roi_norm = ATTACK_TEMPLATE_ROI
@@ -376,23 +475,10 @@ class CombatController(SkillController):
         apx, apy, apw, aph = self._roi_pixels(frame_w, frame_h, attack_roi_norm)
         attack_panel_roi = frame[apy:apy + aph, apx:apx + apw]
         if attack_panel_roi.size == 0:
-            apx = int(0.55 * frame_w)
-            apy = int(0.20 * frame_h)
-            apw = int(0.40 * frame_w)
-            aph = int(0.60 * frame_h)
+            apx, apy, apw, aph = _roi_pixel_rect(frame_w, frame_h, ATTACK_PANEL_FALLBACK_ROI)
             attack_panel_roi = frame[apy:apy + aph, apx:apx + apw]
 
-        ppx = int(0.55 * frame_w)
-        ppy = int(0.07 * frame_h)
-        ppw = int(0.43 * frame_w)
-        pph = int(0.86 * frame_h)
-        bbx = int(0.10 * frame_w)
-        bby = int(0.83 * frame_h)
-        bbw = int(0.80 * frame_w)
-        bbh = int(0.15 * frame_h)
         # R1 focus: limit to monster + attack only for now
-        # prepare_panel_roi = frame[ppy:ppy + pph, ppx:ppx + ppw]
-        # bottom_bar_roi = frame[bby:bby + bbh, bbx:bbx + bbw]
 
         # Disable downstream detections until those phases are implemented
         prepare_boxes: List[Tuple[int, int, int, int]] = []
@@ -458,6 +544,7 @@ class CombatController(SkillController):
         floating_boxes: List[Tuple[int, int, int, int]] = []
         floating_conf = 0.0
         world_tile: Optional[Tuple[int, int]] = None
+        panel_ocr: Optional[Future] = None
         if self._enable_tile_tracker and self._tile_size_px and self._tile_size_px > 0:
             if self._tile_grid is None or self._grid_signature != (rx, ry, rw, rh):
                 self._tile_grid = TileGrid(
@@ -522,48 +609,74 @@ class CombatController(SkillController):
                         ay0 = max(0, ay)
                         ax1 = min(rw, ax + aw)
                         ay1 = min(rh, ay + ah)
-                        if ax1 > ax0 and ay1 > ay0:
-                            menu_roi = frame[ay0:ay1, ax0:ax1]
-                            local_boxes, local_conf = detect_word_ocr_multi(menu_roi, target=self.attack_word)
-                            attack_boxes = [
-                                (bx + ax0, by + ay0, bw, bh)
-                                for (bx, by, bw, bh) in local_boxes
-                            ]
+                        menu_rect = (ax0, ay0, ax1 - ax0, ay1 - ay0)
+                        if ax1 > ax0 and ay1 > ay0 and self.attack_template is not None:
+                            # The button renders identically every time, so a
+                            # template match on the small menu rect is tried
+                            # before any OCR.
+                            tpl_boxes, scores = detect_template_multi(
+                                frame,
+                                self.attack_template,
+                                threshold=self._attack_template_threshold,
+                                roi_xywh=menu_rect,
+                            )
+                            if tpl_boxes:
+                                attack_boxes = tpl_boxes
+                                attack_source = "template_context"
+                                attack_conf = max(scores) if scores else 0.7
+                        if ax1 > ax0 and ay1 > ay0 and not attack_boxes:
+                            # The job reads its own copy of the small panel, so
+                            # it never holds the frame that previews draw on.
+                            panel_ocr = _detect_executor().submit(
+                                detect_word_ocr_multi, attack_panel_roi.copy(), self.attack_word, self._ocr_oem
+                            )
+                            attack_boxes, local_conf = detect_word_ocr_multi(
+                                frame,
+                                target=self.attack_word,
+                                oem=self._ocr_oem,
+                                roi_xywh=menu_rect,
+                            )
                             if attack_boxes:
                                 attack_source = "ocr_context"
                                 attack_conf = local_conf if local_conf > 0.01 else 0.6
                         if not attack_boxes and self.attack_template is not None:
-                            search_regions: List[Tuple[str, np.ndarray, Tuple[int, int]]] = []
+                            # ROIs are passed as rects rather than slices so every
+                            # search shares the frame's cached grayscale.
+                            search_regions: List[Tuple[str, Optional[Tuple[int, int, int, int]]]] = []
                             if attack_panel_roi.size > 0:
-                                search_regions.append(("template_roi", attack_panel_roi, (apx, apy)))
-                            search_regions.append(("template", frame, (0, 0)))
-                            for region_label, region_img, (ox, oy) in search_regions:
+                                search_regions.append(("template_roi", (apx, apy, apw, aph)))
+                            search_regions.append(("template", None))
+                            for region_label, region_rect in search_regions:
                                 tpl_boxes, scores = detect_template_multi(
-                                    region_img,
+                                    frame,
                                     self.attack_template,
                                     threshold=self._attack_template_threshold,
+                                    roi_xywh=region_rect,
                                 )
                                 if tpl_boxes:
-                                    attack_boxes = [
-                                        (bx + ox, by + oy, bw, bh)
-                                        for (bx, by, bw, bh) in tpl_boxes
-                                    ]
+                                    attack_boxes = tpl_boxes
                                     attack_source = region_label
                                     attack_conf = max(scores) if scores else 0.7
                                     break
                     # Fallback to static HUD band on the right-hand side
-                    if not attack_boxes:
-                        local_boxes, local_conf = detect_word_ocr_multi(attack_panel_roi, target=self.attack_word)
+                    if attack_boxes:
+                        if panel_ocr is not None:
+                            panel_ocr.cancel()
+                    else:
+                        if panel_ocr is not None:
+                            local_boxes, local_conf = panel_ocr.result()
+                            local_boxes = [(x + apx, y + apy, w, h) for (x, y, w, h) in local_boxes]
+                        else:
+                            local_boxes, local_conf = detect_word_ocr_multi(
+                                frame, target=self.attack_word, oem=self._ocr_oem, roi_xywh=(apx, apy, apw, aph)
+                            )
                         if local_boxes:
-                            attack_boxes = [
-                                (bx + apx, by + apy, bw, bh)
-                                for (bx, by, bw, bh) in local_boxes
-                            ]
+                            attack_boxes = local_boxes
                             attack_source = "ocr_panel"
                             attack_conf = local_conf if local_conf > 0.01 else 0.6
                     # Global fallback: scan the whole combat frame for the attack button
                     if not attack_boxes:
-                        global_boxes, global_conf = detect_word_ocr_multi(frame, target=self.attack_word)
+                        global_boxes, global_conf = detect_word_ocr_multi(frame, target=self.attack_word, oem=self._ocr_oem)
                         filtered: List[Tuple[int, int, int, int]] = []
                         for (bx, by, bw, bh) in global_boxes:
                             if bh < 15 or bw < 60:
@@ -654,105 +767,102 @@ class CombatController(SkillController):
         )
         self._advance_state(target_ready, attack_boxes, prepare_boxes, digit_boxes, special_attacks_present, planned_clicks, roi_rect, lock_active, prefix_present)
 
-        annotated = frame.copy()
-        nameplate_color = (0, 0, 255)
-        nameplate_label = "OCR"
-        if method and method.startswith("template"):
-            nameplate_color = (180, 0, 255)
-            nameplate_label = "TPL"
-        for (bx, by, bw, bh) in boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), nameplate_color, 2)
-            cv2.putText(
-                annotated,
-                nameplate_label,
-                (bx, max(12, by - 6)),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.45,
-                nameplate_color,
-                1,
-                cv2.LINE_AA,
-            )
-        attack_color = (0, 255, 0)
-        attack_label = "OCR"
-        if attack_source and attack_source.startswith("template"):
-            attack_color = (0, 255, 255)
-            attack_label = "TPL"
-        elif attack_source == "ocr_context":
-            attack_label = "OCR ctx"
-        elif attack_source == "ocr_panel":
-            attack_label = "OCR panel"
-        elif attack_source == "ocr_global":
-            attack_label = "OCR global"
-        for (bx, by, bw, bh) in attack_boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), attack_color, 2)
-            cv2.putText(
-                annotated,
-                attack_label,
-                (bx, max(12, by - 6)),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.45,
-                attack_color,
-                1,
-                cv2.LINE_AA,
-            )
-        for (bx, by, bw, bh) in floating_boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), (255, 128, 0), 1)
-        for (bx, by, bw, bh) in prepare_boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), (255, 0, 0), 2)
-        for (bx, by, bw, bh) in spec_boxes + atks_boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), (0, 255, 255), 2)
-        for (bx, by, bw, bh) in digit_boxes:
-            cv2.rectangle(annotated, (bx, by), (bx + bw, by + bh), (255, 255, 0), 2)
-        if attack_context_rect:
-            ax, ay, aw, ah = attack_context_rect
-            cv2.rectangle(annotated, (ax, ay), (ax + aw, ay + ah), (255, 0, 255), 1)
-        for planned in planned_clicks:
-            fx = planned.x - rx
-            fy = planned.y - ry
-            color = (255, 0, 255)
-            if planned.label == "attack_button":
-                color = (0, 255, 255) if planned.source == "template" else (0, 128, 255)
-            cv2.drawMarker(annotated, (int(fx), int(fy)), color, markerType=cv2.MARKER_CROSS, markerSize=12, thickness=2)
-            cv2.circle(annotated, (int(fx), int(fy)), 14, color, 1)
-            label_text = planned.label.replace("_", " ")
-            cv2.putText(
-                annotated,
-                label_text,
-                (int(fx) + 8, int(fy) + 14),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.45,
-                color,
-                1,
-                cv2.LINE_AA,
-            )
-
-        # Overlay recent real clicks (within ~1s)
-        for click in self.runtime.get_recent_clicks():
-            cx = int(click.get("x", 0)) - rx
-            cy = int(click.get("y", 0)) - ry
-            if cx < 0 or cy < 0 or cx >= rw or cy >= rh:
-                continue
-            cv2.circle(annotated, (cx, cy), 16, (0, 165, 255), 3)
-            cv2.circle(annotated, (cx, cy), 4, (0, 165, 255), -1)
-            label = click.get("label", "")
-            if label:
+        # Drawing and encoding are skipped while no UI is polling the preview.
+        preview: Optional[np.ndarray] = None
+        if self.runtime.preview_wanted():
+            # The frame is ours (each capture is a new array) and detection is
+            # done with it, so draw on it directly.
+            annotated = frame
+            nameplate_color = (0, 0, 255)
+            nameplate_label = "OCR"
+            if method and method.startswith("template"):
+                nameplate_color = (180, 0, 255)
+                nameplate_label = "TPL"
+            _draw_boxes(annotated, boxes, nameplate_color, 2)
+            for (bx, by, bw, bh) in boxes:
                 cv2.putText(
                     annotated,
-                    label,
-                    (cx + 10, cy - 10),
+                    nameplate_label,
+                    (bx, max(12, by - 6)),
                     cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 165, 255),
+                    0.45,
+                    nameplate_color,
+                    1,
+                    cv2.LINE_AA,
+                )
+            attack_color = (0, 255, 0)
+            attack_label = "OCR"
+            if attack_source and attack_source.startswith("template"):
+                attack_color = (0, 255, 255)
+                attack_label = "TPL"
+            elif attack_source == "ocr_context":
+                attack_label = "OCR ctx"
+            elif attack_source == "ocr_panel":
+                attack_label = "OCR panel"
+            elif attack_source == "ocr_global":
+                attack_label = "OCR global"
+            _draw_boxes(annotated, attack_boxes, attack_color, 2)
+            for (bx, by, bw, bh) in attack_boxes:
+                cv2.putText(
+                    annotated,
+                    attack_label,
+                    (bx, max(12, by - 6)),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.45,
+                    attack_color,
+                    1,
+                    cv2.LINE_AA,
+                )
+            _draw_boxes(annotated, floating_boxes, (255, 128, 0), 1)
+            _draw_boxes(annotated, prepare_boxes, (255, 0, 0), 2)
+            _draw_boxes(annotated, spec_boxes + atks_boxes, (0, 255, 255), 2)
+            _draw_boxes(annotated, digit_boxes, (255, 255, 0), 2)
+            if attack_context_rect:
+                ax, ay, aw, ah = attack_context_rect
+                cv2.rectangle(annotated, (ax, ay), (ax + aw, ay + ah), (255, 0, 255), 1)
+            for planned in planned_clicks:
+                fx = planned.x - rx
+                fy = planned.y - ry
+                color = (255, 0, 255)
+                if planned.label == "attack_button":
+                    color = (0, 255, 255) if planned.source == "template" else (0, 128, 255)
+                cv2.drawMarker(annotated, (int(fx), int(fy)), color, markerType=cv2.MARKER_CROSS, markerSize=12, thickness=2)
+                cv2.circle(annotated, (int(fx), int(fy)), 14, color, 1)
+                label_text = planned.label.replace("_", " ")
+                cv2.putText(
+                    annotated,
+                    label_text,
+                    (int(fx) + 8, int(fy) + 14),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.45,
+                    color,
                     1,
                     cv2.LINE_AA,
                 )
 
-        ok, jpg = cv2.imencode(
-            ".jpg",
-            annotated,
-            [int(cv2.IMWRITE_JPEG_QUALITY), 70],
-        )
-        preview = jpg.tobytes() if ok else None
+            # Overlay recent real clicks (within ~1s)
+            for click in self.runtime.get_recent_clicks():
+                cx = int(click.get("x", 0)) - rx
+                cy = int(click.get("y", 0)) - ry
+                if cx < 0 or cy < 0 or cx >= rw or cy >= rh:
+                    continue
+                cv2.circle(annotated, (cx, cy), 16, (0, 165, 255), 3)
+                cv2.circle(annotated, (cx, cy), 4, (0, 165, 255), -1)
+                label = click.get("label", "")
+                if label:
+                    cv2.putText(
+                        annotated,
+                        label,
+                        (cx + 10, cy - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5,
+                        (0, 165, 255),
+                        1,
+                        cv2.LINE_AA,
+                    )
+
+            # Encoded by the runtime's preview thread, off this one.
+            preview = annotated
 
         count = len(boxes)
         if target_ready and raw_nameplate_boxes:
@@ -1091,24 +1201,7 @@ class CombatController(SkillController):
 
     @staticmethod
     def _roi_pixels(width: int, height: int, rel: Tuple[float, float, float, float]) -> Tuple[int, int, int, int]:
-        rx, ry, rw, rh = rel
-        x = int(round(rx * width))
-        y = int(round(ry * height))
-        w_px = max(1, int(round(rw * width)))
-        h_px = max(1, int(round(rh * height)))
-        if x < 0:
-            x = 0
-        if y < 0:
-            y = 0
-        if x >= width:
-            x = width - 1
-        if y >= height:
-            y = height - 1
-        if x + w_px > width:
-            w_px = max(1, width - x)
-        if y + h_px > height:
-            h_px = max(1, height - y)
-        return x, y, w_px, h_px
+        return _roi_pixel_rect(width, height, tuple(rel))
 
     # Utilities -----------------------------------------------------------
     @property
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import threading
-import time
-from typing import Optional, Callable
+from typing import List, Optional, Callable
 
 import ctypes
 from ctypes import wintypes
 
+# Probed once: the import can be slow and fails where the library is missing.
+try:
+    import keyboard  # type: ignore
+except Exception:  # ImportError, or OSError on platforms it cannot hook
+    keyboard = None
+
 
 class HotkeyManager:
     def __init__(self, on_pause_toggle: Callable[[], None], on_kill: Callable[[], None]):
@@ -14,6 +19,9 @@ class HotkeyManager:
         self.on_kill = on_kill
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
+        # Win32 event that wakes the RegisterHotKey message wait on stop().
+        self._wake_handle: Optional[int] = None
+        self._kb_hotkeys: List[object] = []
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -24,31 +32,48 @@ class HotkeyManager:
 
     def stop(self) -> None:
         self._stop.set()
-        # Best-effort unhook for keyboard library if it was used
-        try:
-            import keyboard  # type: ignore
-            keyboard.unhook_all_hotkeys()
-        except Exception:
-            pass
+        handle = self._wake_handle
+        if handle:
+            try:
+                ctypes.windll.kernel32.SetEvent(wintypes.HANDLE(handle))
+            except Exception:
+                pass
+        self._remove_kb_hotkeys()
+
+    def _remove_kb_hotkeys(self) -> None:
+        # Remove only the hotkeys this manager registered with 'keyboard'
+        hotkeys, self._kb_hotkeys = self._kb_hotkeys, []
+        for hotkey in hotkeys:
+            try:
+                keyboard.remove_hotkey(hotkey)
+            except Exception:
+                pass
 
     def _worker(self) -> None:
         # First try the 'keyboard' library; if unavailable, fall back to Win32 RegisterHotKey
-        try:
-            import keyboard  # type: ignore
-            keyboard.add_hotkey('ctrl+alt+p', lambda: self.on_pause_toggle())
-            keyboard.add_hotkey('ctrl+alt+o', lambda: self.on_kill())
-            self._stop.wait()
-            return
-        except Exception:
-            pass
+        if keyboard is not None:
+            try:
+                self._kb_hotkeys.append(keyboard.add_hotkey('ctrl+alt+p', lambda: self.on_pause_toggle()))
+                self._kb_hotkeys.append(keyboard.add_hotkey('ctrl+alt+o', lambda: self.on_kill()))
+            except Exception:
+                # e.g. no permission to hook; use RegisterHotKey instead
+                self._remove_kb_hotkeys()
+            else:
+                self._stop.wait()
+                return
 
         user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
         MOD_ALT = 0x0001
         MOD_CONTROL = 0x0002
         VK_P = 0x50
         VK_O = 0x4F
         WM_HOTKEY = 0x0312
         PM_REMOVE = 0x0001
+        QS_HOTKEY = 0x0080
+        INFINITE = 0xFFFFFFFF
+        WAIT_OBJECT_0 = 0
+        WAIT_FAILED = 0xFFFFFFFF
 
         # Define MSG struct
         class POINT(ctypes.Structure):
@@ -68,10 +93,22 @@ class HotkeyManager:
         user32.RegisterHotKey(None, 1, MOD_CONTROL | MOD_ALT, VK_P)
         user32.RegisterHotKey(None, 2, MOD_CONTROL | MOD_ALT, VK_O)
 
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        wake = kernel32.CreateEventW(None, True, False, None)
+        handles = (wintypes.HANDLE * 1)(wake)
+        self._wake_handle = wake
+        user32.MsgWaitForMultipleObjects.restype = wintypes.DWORD
+
         msg = MSG()
         try:
+            # Block until a hotkey arrives or stop() signals the wake event.
             while not self._stop.is_set():
-                if user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                rc = user32.MsgWaitForMultipleObjects(1, handles, False, INFINITE, QS_HOTKEY)
+                if rc == WAIT_OBJECT_0:
+                    break
+                if rc == WAIT_FAILED:
+                    self._stop.wait(0.05)
+                while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
                     if msg.message == WM_HOTKEY:
                         if msg.wParam == 1:
                             try: self.on_pause_toggle()
@@ -79,7 +116,8 @@ class HotkeyManager:
                         elif msg.wParam == 2:
                             try: self.on_kill()
                             except Exception: pass
-                time.sleep(0.05)
         finally:
+            self._wake_handle = None
+            kernel32.CloseHandle(wintypes.HANDLE(wake))
             user32.UnregisterHotKey(None, 1)
             user32.UnregisterHotKey(None, 2)
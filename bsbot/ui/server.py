@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import io
 import os
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, Optional
 
 from flask import Flask, send_file, request, jsonify, Response, render_template
 import logging
@@ -13,12 +15,90 @@ from bsbot.ui.hotkeys import HotkeyManager
 from bsbot.core.logging import init_logging
 from bsbot.core.config import load_profile, load_keys, list_monster_profiles, list_interface_profiles
 
+try:
+    from flask_compress import Compress
+except ImportError:  # optional: responses are served uncompressed
+    Compress = None
+
+try:
+    from waitress import serve
+except ImportError:  # optional: falls back to Flask's threaded dev server
+    serve = None
+
+
+# An MJPEG connection only notices a vanished client when it writes, so idle
+# streams re-send the last frame every _PREVIEW_KEEPALIVE_S and every stream
+# ends after _PREVIEW_STREAM_MAX_S (the page reconnects before that). This
+# keeps abandoned streams from holding server threads and preview rendering.
+_PREVIEW_KEEPALIVE_S = 5.0
+_PREVIEW_STREAM_MAX_S = 60.0
+# Each open stream occupies a server thread. waitress gets this many threads
+# on top of _SERVER_BASE_THREADS, so streams never starve the JSON endpoints.
+_PREVIEW_MAX_STREAMS = 2
+_SERVER_BASE_THREADS = 4
+
+
+def _mjpeg_part(frame: bytes) -> bytes:
+    return (
+        b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+        + str(len(frame)).encode("ascii")
+        + b"\r\n\r\n"
+        + frame
+        + b"\r\n"
+    )
+
+
+class _PreviewStreams:
+    """Admission for MJPEG streams: at most ``limit`` at once, one per client.
+
+    A page's reconnect (same ``client`` id) supersedes its previous stream,
+    which ends at its next wake-up instead of running out its lifetime.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._next_token = 0
+        self._open: Dict[int, str] = {}
+        self._newest: Dict[str, int] = {}
+
+    def acquire(self, client: str) -> Optional[int]:
+        with self._lock:
+            live = sum(1 for token, owner in self._open.items() if not owner or self._newest.get(owner) == token)
+            if client and self._newest.get(client) in self._open:
+                live -= 1  # replaced by this request
+            if live >= self._limit:
+                return None
+            self._next_token += 1
+            token = self._next_token
+            self._open[token] = client
+            if client:
+                self._newest[client] = token
+            return token
+
+    def superseded(self, token: int) -> bool:
+        with self._lock:
+            client = self._open.get(token)
+            return bool(client) and self._newest.get(client) != token
+
+    def release(self, token: int) -> None:
+        with self._lock:
+            client = self._open.pop(token, None)
+            if client and self._newest.get(client) == token:
+                del self._newest[client]
+
 
 def create_app() -> Flask:
     # Templates are now in the same directory as this file
     app = Flask(__name__, static_folder=None, template_folder='templates')
+    if Compress is not None:
+        # gzip JSON bodies large enough to benefit; preview JPEGs are left alone
+        app.config.setdefault("COMPRESS_MIMETYPES", ["application/json"])
+        app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+        Compress(app)
     logger = init_logging(level=os.environ.get("LOG_LEVEL", "INFO"))
     rt = DetectorRuntime()
+    preview_streams = _PreviewStreams(_PREVIEW_MAX_STREAMS)
     # register global hotkeys: Ctrl+Alt+P (pause/resume), Ctrl+Alt+O (kill)
     hk = HotkeyManager(
         on_pause_toggle=lambda: (_toggle_pause(rt, logger)),
@@ -88,20 +168,14 @@ def create_app() -> Flask:
 
     @app.get("/api/status")
     def api_status():
+        # The UI fetches the preview only when preview_seq moves, so status
+        # polls are what keep the runtime rendering it.
+        rt.note_preview_request()
         s = rt.snapshot()
-
-        # Load config values (will be empty dict if config files don't exist)
-        try:
-            profile_config = load_profile()
-            keys_config = load_keys()
-        except Exception:
-            profile_config = {}
-            keys_config = {}
-
         out = {
             "running": s.running,
             "paused": s.paused,
-            "last_result": s.last_result,
+            "preview_seq": s.last_frame_seq,
             "title": s.title,
             "word": s.word,
             "prefix_word": s.prefix_word,
@@ -131,21 +205,85 @@ def create_app() -> Flask:
             },
             "interactables": getattr(s, "interactables", []),
             "calibration": getattr(s, "calibration", {}),
-            # Include config values when available
+        }
+        # The detection result is already encoded by the runtime; splice it
+        # in rather than serializing its boxes again on every poll.
+        rest = app.json.dumps(out)[1:-1].strip()
+        body = '{"last_result":' + rt.latest_result_json() + ("," + rest if rest else "") + "}"
+        return Response(body, mimetype="application/json")
+
+    @app.get("/api/config")
+    def api_config():
+        # Load config values (will be empty dict if config files don't exist)
+        try:
+            profile_config = load_profile()
+            keys_config = load_keys()
+        except Exception:
+            profile_config = {}
+            keys_config = {}
+        return jsonify({
             "profile": profile_config,
             "keys": keys_config,
             "monsters": list_monster_profiles(),
             "interfaces": list_interface_profiles(),
-        }
-        return jsonify(out)
+        })
 
 
     @app.get("/api/preview.jpg")
     def api_preview():
-        s = rt.snapshot()
-        if not s.last_frame:
+        rt.note_preview_request()
+        # Bytes are immutable and published as one (frame, seq) pair, so the
+        # preview is served without taking the runtime lock.
+        frame, seq = rt.latest_preview()
+        if not frame:
             return ("", 204)
-        return send_file(io.BytesIO(s.last_frame), mimetype="image/jpeg", as_attachment=False, download_name="preview.jpg")
+        # The frame is encoded once by the detector loop; the sequence number
+        # doubles as an ETag so re-polls of an unchanged frame get a 304.
+        return send_file(
+            io.BytesIO(frame),
+            mimetype="image/jpeg",
+            as_attachment=False,
+            download_name="preview.jpg",
+            conditional=True,
+            etag=f"frame-{seq}",
+            max_age=0,
+        )
+
+    @app.get("/api/preview.mjpg")
+    def api_preview_stream():
+        # multipart/x-mixed-replace pushes each new preview once, instead of
+        # the page re-requesting preview.jpg whenever preview_seq moves.
+        token = preview_streams.acquire(request.args.get("client", ""))
+        if token is None:
+            return Response("too many preview streams", status=503, mimetype="text/plain")
+
+        def frames():
+            seq = -1
+            last: Optional[bytes] = None
+            sent_at = started = time.monotonic()
+            while time.monotonic() - started < _PREVIEW_STREAM_MAX_S and not preview_streams.superseded(token):
+                rt.note_preview_request()
+                frame, new_seq = rt.wait_for_preview(seq, timeout=1.0)
+                now = time.monotonic()
+                if new_seq != seq:
+                    seq = new_seq
+                    if frame:
+                        last, sent_at = frame, now
+                        yield _mjpeg_part(frame)
+                        continue
+                if last is not None and now - sent_at >= _PREVIEW_KEEPALIVE_S:
+                    sent_at = now
+                    yield _mjpeg_part(last)
+
+        response = Response(
+            frames(),
+            mimetype="multipart/x-mixed-replace; boundary=frame",
+            headers={"Cache-Control": "no-store"},
+        )
+        # Runs when the server closes the response, even if the generator
+        # never started (client gone before the first write).
+        response.call_on_close(lambda: preview_streams.release(token))
+        return response
 
     @app.get("/api/logs/tail")
     def api_logs_tail():
@@ -155,9 +293,7 @@ def create_app() -> Flask:
         if not os.path.exists(path):
             return ("", 204)
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()[-n:]
-            return Response("".join(lines), mimetype="text/plain")
+            return Response(_tail_lines(path, n), mimetype="text/plain")
         except Exception:
             return Response(traceback.format_exc(), mimetype="text/plain", status=500)
 
@@ -278,6 +414,33 @@ def create_app() -> Flask:
     return app
 
 
+def _tail_lines(path: str, n: int) -> str:
+    """Last ``n`` lines of ``path``, reading back from the end of the file.
+
+    Starts with a 64 KiB block and doubles it until it holds ``n`` complete
+    lines, so a long-running log is never read in full.
+    """
+    if n <= 0:
+        return ""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        block = min(size, max(n * 200, 65536))
+        while True:
+            f.seek(size - block)
+            buf = f.read(block)
+            # n line breaks plus a partial line (or the start of the file)
+            # before them guarantee n whole lines.
+            if block == size or buf.count(b"\n") > n:
+                break
+            block = min(size, block * 2)
+    lines = buf.splitlines(keepends=True)
+    if block < size:
+        lines = lines[1:]  # may start mid-line
+    text = b"".join(lines[-n:]).decode("utf-8", errors="ignore")
+    # Same newline translation as a text-mode read (Windows logs end in \r\n).
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def _toggle_pause(rt: DetectorRuntime, logger: logging.Logger):
     s = rt.snapshot()
     if s.running and not s.paused:
@@ -310,7 +473,10 @@ def _kill_process(logger: logging.Logger):
 def main() -> None:
     app = create_app()
     port = int(os.environ.get("PORT", "8083"))
-    app.run(host="127.0.0.1", port=port, debug=False, threaded=True)
+    if serve is not None:
+        serve(app, host="127.0.0.1", port=port, threads=_SERVER_BASE_THREADS + _PREVIEW_MAX_STREAMS)
+    else:
+        app.run(host="127.0.0.1", port=port, debug=False, threaded=True)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple, List
+import hashlib
 import os
 import shutil
+import threading
+import weakref
 
 import cv2
 import numpy as np
 import pytesseract
 
+try:
+    from tesserocr import OEM, PSM, RIL, PyTessBaseAPI, iterate_level
+except ImportError:  # optional: OCR falls back to the pytesseract subprocess
+    PyTessBaseAPI = None
+
+try:
+    import xxhash
+except ImportError:  # optional: OCR cache keys fall back to blake2b
+    xxhash = None
+
+try:
+    from numba import njit
+except ImportError:  # optional: NMS without cv2.dnn falls back to numpy
+    njit = None
+
+from bsbot.vision.masks import red_mask
+
 
 @dataclass
 class Detection:
@@ -18,17 +40,347 @@ class Detection:
     method: str = ""
 
 
-def _red_mask(bgr: np.ndarray) -> np.ndarray:
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-    lower1 = np.array([0, 120, 120], dtype=np.uint8)
-    upper1 = np.array([10, 255, 255], dtype=np.uint8)
-    lower2 = np.array([170, 120, 120], dtype=np.uint8)
-    upper2 = np.array([180, 255, 255], dtype=np.uint8)
-    m1 = cv2.inRange(hsv, lower1, upper1)
-    m2 = cv2.inRange(hsv, lower2, upper2)
-    mask = cv2.bitwise_or(m1, m2)
-    mask = cv2.medianBlur(mask, 3)
-    return mask
+_ALPHA_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_DIGIT_WHITELIST = "0123456789"
+# Dictionary lookups are pure overhead once the charset is whitelisted.
+_OCR_DICT_FLAGS = "-c load_system_dawg=0 -c load_freq_dawg=0"
+# Digits use a fixed font, so the (much cheaper) legacy engine is good enough.
+_DIGIT_OCR_OEM: Optional[int] = 0
+# Flipped off the first time tesseract reports the legacy model is missing.
+_legacy_oem_available = True
+
+
+def _ocr_config(whitelist: str, oem: Optional[int] = None, psm: int = 6) -> str:
+    oem_flag = f" --oem {oem}" if oem is not None else ""
+    return f"--psm {psm}{oem_flag} -l eng {_OCR_DICT_FLAGS} -c tessedit_char_whitelist={whitelist}"
+
+
+# In-process OCR through libtesseract (tesserocr) when it is installed; each
+# call then skips the tesseract process launch and temp-file round trip.
+# BSBOT_TESSEROCR=0 forces the pytesseract subprocess.
+_USE_TESSEROCR = PyTessBaseAPI is not None and os.environ.get("BSBOT_TESSEROCR", "1") != "0"
+# tesserocr handles are not thread-safe, so every OCR thread gets its own.
+# Handles live for the life of the thread; bumping _tess_generation (when the
+# tesseract install changes) makes each thread rebuild them on next use.
+_tess_local = threading.local()
+_tess_generation = 0
+# (explicit/env path,) that configure_tesseract last resolved to a binary.
+_tess_configured_for: Optional[Tuple[Optional[str]]] = None
+# Normalized (binary, tessdata dir) the current _tess_generation belongs to.
+_tess_install: Optional[Tuple[str, str]] = None
+
+# The red and grayscale word passes run concurrently (tesserocr releases the
+# GIL; pytesseract waits on a subprocess). BSBOT_OCR_PARALLEL=0 runs them
+# back to back and skips the grayscale pass when the red pass hits.
+_OCR_PARALLEL = os.environ.get("BSBOT_OCR_PARALLEL", "1") != "0"
+_ocr_pool: Optional[ThreadPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _ocr_executor() -> ThreadPoolExecutor:
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bsbot-ocr")
+        return _ocr_pool
+
+
+def _tessdata_dir() -> Optional[str]:
+    """``tessdata`` next to the configured tesseract binary, if there is one."""
+    cmd_dir = os.path.dirname(pytesseract.pytesseract.tesseract_cmd or "")
+    cand = os.path.join(cmd_dir, "tessdata") if cmd_dir else ""
+    return cand if cand and os.path.isdir(cand) else None
+
+
+def _tess_api(oem: Optional[int]) -> "PyTessBaseAPI":
+    """Long-lived tesserocr handle for ``oem`` owned by the calling thread."""
+    apis: Dict[Optional[int], "PyTessBaseAPI"] = getattr(_tess_local, "apis", None)
+    if apis is None or getattr(_tess_local, "generation", None) != _tess_generation:
+        for stale in (apis or {}).values():
+            stale.End()
+        apis = _tess_local.apis = {}
+        _tess_local.generation = _tess_generation
+    api = apis.get(oem)
+    if api is None:
+        api = PyTessBaseAPI(init=False)
+        kwargs = {
+            "lang": "eng",
+            "oem": OEM.DEFAULT if oem is None else oem,
+            "variables": {"load_system_dawg": "0", "load_freq_dawg": "0"},
+        }
+        path = _tessdata_dir()
+        if path:
+            kwargs["path"] = path
+        try:
+            api.InitFull(**kwargs)
+        except Exception:
+            api.End()
+            raise
+        api.SetPageSegMode(PSM.SINGLE_BLOCK)
+        apis[oem] = api
+    return api
+
+
+def _tesserocr_data(img: np.ndarray, whitelist: str, oem: Optional[int]) -> dict:
+    """``image_to_data``-shaped word rows from tesserocr for a grayscale image."""
+    img = np.ascontiguousarray(img)
+    out: dict = {"text": [], "conf": [], "left": [], "top": [], "width": [], "height": []}
+    api = _tess_api(oem)
+    api.SetVariable("tessedit_char_whitelist", whitelist)
+    api.SetImageBytes(img.tobytes(), img.shape[1], img.shape[0], 1, img.strides[0])
+    api.Recognize()
+    it = api.GetIterator()
+    if it is None:
+        return out
+    for word in iterate_level(it, RIL.WORD):
+        bbox = word.BoundingBox(RIL.WORD)
+        if bbox is None:
+            continue
+        x1, y1, x2, y2 = bbox
+        out["text"].append(word.GetUTF8Text(RIL.WORD) or "")
+        out["conf"].append(word.Confidence(RIL.WORD))
+        out["left"].append(x1)
+        out["top"].append(y1)
+        out["width"].append(x2 - x1)
+        out["height"].append(y2 - y1)
+    return out
+
+
+# Exact-content OCR result cache: static panels and nameplates that did not
+# change between polls skip Tesseract entirely. Keys hash the OCR input bytes.
+# Sized for the handful of OCR regions (word passes, menu, panel, digits) a
+# tick reads, times the few screens a fight cycles through.
+_OCR_CACHE_SIZE = 128
+_ocr_cache: "OrderedDict[Tuple, dict]" = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+
+def _image_digest(img: np.ndarray) -> int:
+    buf = np.ascontiguousarray(img)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(buf)
+    return int.from_bytes(hashlib.blake2b(buf, digest_size=8).digest(), "little")
+
+
+def clear_ocr_cache() -> None:
+    """Drop cached OCR results (e.g. after the tesseract binary changes)."""
+    with _ocr_cache_lock:
+        _ocr_cache.clear()
+
+
+def _image_to_data(img: np.ndarray, whitelist: str, oem: Optional[int] = None) -> Optional[dict]:
+    """Run OCR and return ``image_to_data``-style columns, or ``None`` on failure.
+
+    Results are cached by image content, so the returned dict must be treated
+    as read-only.
+    """
+    # ROI views are strided; copy once here so the digest and the OCR engine
+    # both read the same contiguous buffer instead of each making their own.
+    img = np.ascontiguousarray(img)
+    key = (_image_digest(img), img.shape, whitelist, oem)
+    with _ocr_cache_lock:
+        data = _ocr_cache.get(key)
+        if data is not None:
+            _ocr_cache.move_to_end(key)
+            return data
+    data = _run_ocr_engine(img, whitelist, oem)
+    if data is not None:
+        with _ocr_cache_lock:
+            _ocr_cache[key] = data
+            while len(_ocr_cache) > _OCR_CACHE_SIZE:
+                _ocr_cache.popitem(last=False)
+    return data
+
+
+def _run_ocr_engine(img: np.ndarray, whitelist: str, oem: Optional[int] = None) -> Optional[dict]:
+    """Uncached OCR: tesserocr in-process when available, else pytesseract.
+
+    Requesting the legacy engine (``oem=0``) needs legacy components in the
+    installed traineddata; if they are missing we fall back to the default
+    engine and stop asking for legacy on later calls.
+    """
+    global _legacy_oem_available
+    if oem == 0 and not _legacy_oem_available:
+        oem = None
+    try:
+        if _USE_TESSEROCR:
+            return _tesserocr_data(img, whitelist, oem)
+        return pytesseract.image_to_data(img, config=_ocr_config(whitelist, oem), output_type=pytesseract.Output.DICT)
+    except Exception:
+        if oem != 0:
+            return None
+    _legacy_oem_available = False
+    return _run_ocr_engine(img, whitelist, None)
+
+
+_OCR_BOX_KEYS = ("left", "top", "width", "height")
+
+
+def _parse_confs(col: Sequence, n: int) -> np.ndarray:
+    """Tesseract confidences as float32; non-numeric entries read as 0, negatives clip to 0."""
+    confs = np.zeros(n, dtype=np.float32)
+    m = min(n, len(col))
+    try:
+        # Numbers and numeric strings convert in one C-level pass.
+        confs[:m] = np.asarray(col[:m], dtype=np.float32)
+    except (TypeError, ValueError):
+        def _num(c) -> float:
+            s = str(c)
+            return float(s) if s.lstrip("-").replace(".", "", 1).isdigit() else 0.0
+
+        confs[:m] = np.fromiter((_num(c) for c in col[:m]), dtype=np.float32, count=m)
+    return np.clip(confs, 0.0, None, out=confs)
+
+
+class OcrRows(NamedTuple):
+    """OCR words as parallel arrays, so filters are boolean masks rather than row walks."""
+
+    texts: np.ndarray  # lower-cased, unicode
+    confs: np.ndarray  # float32, 0-100
+    boxes: np.ndarray  # (N, 4) int32 x, y, w, h in OCR-image pixels
+
+
+def _ocr_rows(data: dict) -> OcrRows:
+    """Non-empty rows of an ``image_to_data`` dict.
+
+    Rows without a complete box are dropped.
+    """
+    text_col = data.get("text", [])
+    cols = [data.get(k, ()) for k in _OCR_BOX_KEYS]
+    # Tesseract's columns always match in length; the shape is checked once
+    # here, never per row.
+    n = min(len(text_col), *(len(c) for c in cols))
+    if n == 0:
+        return OcrRows(np.zeros(0, dtype=str), np.zeros(0, dtype=np.float32), np.zeros((0, 4), dtype=np.int32))
+    if any(len(c) != n for c in (text_col, *cols)):
+        text_col = text_col[:n]
+        cols = [c[:n] for c in cols]
+    texts = np.array([(t or "").strip().lower() for t in text_col], dtype=str)
+    keep = texts != ""
+    boxes = np.empty((n, 4), dtype=np.int32)
+    for j, col in enumerate(cols):
+        boxes[:, j] = col
+    confs = _parse_confs(data.get("conf", []), n)
+    return OcrRows(texts[keep], confs[keep], boxes[keep])
+
+
+def _contains(texts: np.ndarray, target: str) -> np.ndarray:
+    """Boolean mask of ``texts`` entries containing ``target``."""
+    return np.char.find(texts, target) >= 0
+
+
+# Grayscale passes read large UI text; sources this tall skip the OCR upscale.
+# The red nameplate pass (small font) always upscales. BSBOT_OCR_NATIVE_GRAY=0
+# restores upscaling for every pass.
+_OCR_NATIVE_MIN_HEIGHT = 24
+_OCR_NATIVE_GRAY = os.environ.get("BSBOT_OCR_NATIVE_GRAY", "1") != "0"
+# Native-size sources taller than this many pixels are shrunk (INTER_AREA) to
+# this height before OCR; Tesseract's cost grows faster than the pixel count
+# and headline UI text stays legible at half size. 0 (default) disables it.
+_OCR_MAX_NATIVE_HEIGHT = int(os.environ.get("BSBOT_OCR_MAX_HEIGHT", "0") or 0)
+# Bilinear is a quarter of bicubic's taps and reads the same for 1.5x text.
+_OCR_UPSCALE_INTERP = cv2.INTER_LINEAR
+
+
+def _upscale_for_ocr(gray_like: np.ndarray, scale: float, allow_native: bool = False, dst: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+    """Return the OCR input and the scale factor applied to ``gray_like``.
+
+    ``dst`` may be a buffer of the upscaled shape (see ``_upscaled_shape``).
+    """
+    if allow_native and gray_like.shape[0] >= _OCR_NATIVE_MIN_HEIGHT:
+        h, w = gray_like.shape[:2]
+        if 0 < _OCR_MAX_NATIVE_HEIGHT < h:
+            shrink = _OCR_MAX_NATIVE_HEIGHT / h
+            size = (max(1, int(round(w * shrink))), _OCR_MAX_NATIVE_HEIGHT)
+            return cv2.resize(gray_like, size, interpolation=cv2.INTER_AREA), shrink
+        return gray_like, 1.0
+    h, w = _upscaled_shape(gray_like, scale)
+    return cv2.resize(gray_like, (w, h), dst=dst, interpolation=_OCR_UPSCALE_INTERP), scale
+
+
+def _upscaled_shape(gray_like: np.ndarray, scale: float) -> Tuple[int, int]:
+    h, w = gray_like.shape[:2]
+    return int(round(h * scale)), int(round(w * scale))
+
+
+def _roi_bounds(shape: Tuple[int, ...], roi_xywh: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """``roi_xywh`` clamped to an image of ``shape``, as x0, y0, x1, y1."""
+    fh, fw = shape[:2]
+    rx, ry, rw, rh = (int(v) for v in roi_xywh)
+    x0 = min(max(rx, 0), fw)
+    y0 = min(max(ry, 0), fh)
+    x1 = min(max(rx + rw, x0), fw)
+    y1 = min(max(ry + rh, y0), fh)
+    return x0, y0, x1, y1
+
+
+def _roi_view(bgr: np.ndarray, roi_xywh: Optional[Tuple[int, int, int, int]]) -> Tuple[np.ndarray, int, int]:
+    """Zero-copy view of ``roi_xywh`` (clamped to the frame) plus its origin."""
+    if roi_xywh is None:
+        return bgr, 0, 0
+    x0, y0, x1, y1 = _roi_bounds(bgr.shape, roi_xywh)
+    return bgr[y0:y1, x0:x1], x0, y0
+
+
+def _crop_rect(rect: Tuple[int, int, int, int], shape: Tuple[int, ...], pad: int, step: int) -> Tuple[int, int, int, int]:
+    """Pad ``rect`` (x, y, w, h) and round its size up to a multiple of ``step``.
+
+    The result stays centred on ``rect`` and inside an image of ``shape``.
+    Rounding keeps crop shapes (and the buffers sized from them) stable from
+    frame to frame, and gives small text at least ``step`` pixels of context.
+    """
+    fh, fw = shape[:2]
+    x, y, w, h = rect
+    cw = min(-(-(w + 2 * pad) // step) * step, fw)
+    ch = min(-(-(h + 2 * pad) // step) * step, fh)
+    x0 = min(max(x + w // 2 - cw // 2, 0), fw - cw)
+    y0 = min(max(y + h // 2 - ch // 2, 0), fh - ch)
+    return x0, y0, cw, ch
+
+
+def _unscale_boxes(boxes: np.ndarray, scale: float, origin: Tuple[int, int]) -> np.ndarray:
+    """Map (N, 4) OCR-image boxes back to frame pixels."""
+    out = (boxes / scale).astype(np.int32)
+    out[:, 0] += origin[0]
+    out[:, 1] += origin[1]
+    return out
+
+
+def _offset_boxes(boxes: List[Tuple[int,int,int,int]], dx: int, dy: int) -> List[Tuple[int,int,int,int]]:
+    if not (dx or dy):
+        return boxes
+    return [(x + dx, y + dy, w, h) for (x, y, w, h) in boxes]
+
+
+# Speckle cleanup for the red mask. The default 3x3 median keeps 1-2 px
+# nameplate strokes that a 3x3 opening would erase; BSBOT_RED_MASK_OPEN=1
+# trades those for the cheaper erode/dilate pass.
+_RED_MASK_OPEN = os.environ.get("BSBOT_RED_MASK_OPEN", "0") == "1"
+
+
+def _red_mask(bgr: np.ndarray, hsv: Optional[np.ndarray] = None, tmp: Optional[np.ndarray] = None, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """``red_mask`` with the OCR pass's configured speckle cleanup."""
+    return red_mask(bgr, hsv, tmp, dst, open_speckle=_RED_MASK_OPEN)
+
+
+def configure_opencv() -> None:
+    """Enable OpenCV's optimized kernels and size its worker pool.
+
+    By default OpenCV parallelizes over every core, which competes with the
+    web server, capture and OCR threads; leave two cores for those unless
+    ``BSBOT_CV_THREADS`` sets the count (``0`` runs OpenCV single-threaded).
+    """
+    cv2.setUseOptimized(True)
+    default = max(1, (os.cpu_count() or 4) - 2)
+    try:
+        threads = int(os.environ.get("BSBOT_CV_THREADS", default))
+    except ValueError:
+        threads = default
+    cv2.setNumThreads(max(0, threads))
+
+
+def _normalized_path(path: Optional[str]) -> str:
+    return os.path.normcase(os.path.realpath(path)) if path else ""
 
 
 def configure_tesseract(explicit_path: Optional[str] = None) -> None:
@@ -39,11 +391,20 @@ def configure_tesseract(explicit_path: Optional[str] = None) -> None:
     2) PATH lookup via shutil.which('tesseract')
     3) Common install locations under Program Files
     """
+    global _tess_generation, _tess_configured_for, _tess_install
     cand: Optional[str] = None
     # 0) environment variable wins if present
     env_path = os.environ.get("TESSERACT_PATH")
     if not explicit_path and env_path:
         explicit_path = env_path
+    # Detectors call this with no path to make sure *some* binary is set;
+    # once one has been resolved, keep it rather than re-probing PATH.
+    if not explicit_path and _tess_configured_for is not None:
+        return
+    # Controllers call this every frame; skip the PATH and disk probes once
+    # these inputs have resolved to a binary.
+    if (explicit_path,) == _tess_configured_for:
+        return
 
     if explicit_path and os.path.exists(explicit_path):
         cand = explicit_path
@@ -60,280 +421,793 @@ def configure_tesseract(explicit_path: Optional[str] = None) -> None:
                 if os.path.exists(p):
                     cand = p
                     break
-    if cand:
+    if not cand:
+        return
+    _tess_configured_for = (explicit_path,)
+    # Compare normalized paths: ".EXE" vs ".exe" or relative vs absolute
+    # spellings of one binary must not count as a change.
+    if _normalized_path(cand) != _normalized_path(pytesseract.pytesseract.tesseract_cmd):
         pytesseract.pytesseract.tesseract_cmd = cand
+    # Rebuilding tesserocr handles reloads the model, so only a different
+    # binary or tessdata dir bumps the generation and drops cached OCR.
+    install = (_normalized_path(cand), _normalized_path(_tessdata_dir()))
+    if install != _tess_install:
+        _tess_install = install
+        _tess_generation += 1
+        clear_ocr_cache()
 
 
-def detect_word_ocr(bgr: np.ndarray, target: str = "wendigo") -> Detection:
-    """OCR-based single best match for ``target``.
+def warm_up_ocr() -> None:
+    """Run one throwaway OCR so the first real frame skips the cold start.
 
-    Tries a red-text focused pass first (for enemy nameplates),
-    then falls back to a general grayscale OCR pass to support
-    non-red UI elements like the "Attack" button.
+    Loads the engine and language data on the calling thread and on an OCR
+    pool worker, which is where the concurrent grayscale pass runs.
     """
-    # Ensure tesseract is configured; no-op if already set
-    configure_tesseract()
+    blank = np.full((32, 32), 255, np.uint8)
+    try:
+        _run_ocr_engine(blank, _ALPHA_WHITELIST)
+        if _OCR_PARALLEL:
+            _ocr_executor().submit(_run_ocr_engine, blank, _ALPHA_WHITELIST).result()
+    except Exception:
+        pass
 
-    def _run_ocr(gray_like: np.ndarray, scale: float = 1.5) -> Detection:
-        resized = cv2.resize(gray_like, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-        cfg = "--psm 6 -l eng -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-        try:
-            data = pytesseract.image_to_data(resized, config=cfg, output_type=pytesseract.Output.DICT)
-        except Exception:
-            return Detection(False, method="ocr")
-        best_det = Detection(False, method="ocr")
-        n = len(data.get("text", []))
-        for i in range(n):
-            text = (data["text"][i] or "").strip().lower()
-            if not text:
-                continue
-            conf_list = data.get("conf", [])
-            conf_str = conf_list[i] if i < len(conf_list) else "0"
+
+# Below this many red pixels there is no nameplate to read and the red OCR
+# pass is skipped.
+_MIN_RED_PIXELS = 50
+# Finished lookups are remembered by exact frame content, so an unchanged
+# (idle) screen skips preprocessing and OCR altogether. Only with xxhash: a
+# blake2b digest of a full frame costs about as much as the work it saves.
+_RESULT_CACHE = xxhash is not None
+# The red pass reads only the bounding box of the mask, padded and rounded up
+# to a multiple of _RED_CROP_STEP pixels.
+_RED_CROP_PAD = 6
+_RED_CROP_STEP = 32
+
+
+class WordDetector:
+    """Red-mask/grayscale OCR word detection with reusable scratch buffers.
+
+    Intermediate images (HSV, masked gray, upscaled OCR input) are kept per
+    (name, shape) and rewritten in place on later frames of the same size,
+    instead of being reallocated on every call. The grayscale frame and red
+    mask come from the per-frame cache shared by all threads. Not
+    thread-safe; the module-level helpers use one instance per thread.
+    """
+
+    _MAX_BUFFERS = 24
+    _MAX_RESULTS = 32
+
+    def __init__(self) -> None:
+        self._buffers: "OrderedDict[Tuple[str, Tuple[int, ...]], np.ndarray]" = OrderedDict()
+        # Results for the most recent frame object, so several targets looked
+        # up in one frame (word, prefix, ...) share one preprocessing pass.
+        self._frame: Optional[np.ndarray] = None
+        self._bounds: Optional[Tuple[int, int, int, int]] = None
+        self._prepared: Tuple[np.ndarray, Optional[np.ndarray], Tuple[int, int]] = (np.empty(0, np.uint8), None, (0, 0))
+        self._inputs: Dict[str, Tuple[np.ndarray, float]] = {}
+        # Content digests of the most recent frame object, per region.
+        self._digest_frame: Optional[np.ndarray] = None
+        self._digests: Dict[Optional[Tuple[int, int, int, int]], int] = {}
+        self._results: "OrderedDict[Tuple, object]" = OrderedDict()
+
+    def _result_key(self, frame: np.ndarray, bounds: Optional[Tuple[int, int, int, int]], *parts: object) -> Optional[Tuple]:
+        """Cache key for a lookup on the exact pixels of ``frame`` within ``bounds``."""
+        if not _RESULT_CACHE:
+            return None
+        if frame is not self._digest_frame:
+            self._digest_frame = frame
+            self._digests.clear()
+        digest = self._digests.get(bounds)
+        if digest is None:
+            region = frame
+            if bounds is not None:
+                x0, y0, x1, y1 = bounds
+                region = frame[y0:y1, x0:x1]
+            digest = self._digests[bounds] = _image_digest(region)
+        # The generation invalidates results when the tesseract install changes.
+        return (digest, frame.shape, bounds, _tess_generation) + parts
+
+    def _memo(self, key: Optional[Tuple], compute: Callable[[], object]) -> object:
+        if key is None:
+            return compute()
+        value = self._results.get(key)
+        if value is not None:
+            self._results.move_to_end(key)
+            return value
+        value = compute()
+        self._results[key] = value
+        while len(self._results) > self._MAX_RESULTS:
+            self._results.popitem(last=False)
+        return value
+
+    def _scratch(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        key = (name, tuple(shape))
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._buffers[key] = buf
+            while len(self._buffers) > self._MAX_BUFFERS:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buf
+
+    def _prepare(self, frame: np.ndarray, bounds: Optional[Tuple[int, int, int, int]] = None) -> Tuple[np.ndarray, Optional[np.ndarray], Tuple[int, int]]:
+        """Grayscale region, masked crop and the crop's origin in the region.
+
+        ``bounds`` (x0, y0, x1, y1) limits the work to that part of ``frame``.
+        The grayscale and red mask are views of per-frame images shared
+        through ``_frame_cache``: every ROI and target looked up on a frame
+        (and template matching on it) reuses one conversion. The masked crop
+        is the grayscale restricted to the red mask, cut down to the mask's
+        bounding box so Tesseract does not scan the empty rest of the frame.
+        It is ``None`` when fewer than ``_MIN_RED_PIXELS`` are red, in which
+        case the red OCR pass has nothing to read. Repeated calls with the
+        same frame object and bounds return the cached result.
+        """
+        if frame is self._frame and bounds == self._bounds:
+            return self._prepared
+        self._frame = None
+        self._inputs.clear()
+        frames = _frame_cache()
+        gray = frames.get(frame, "gray", lambda: cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        # HSV and the hue plane are temporaries and reuse scratch buffers; the
+        # mask itself is cached with the frame, so it gets its own array.
+        mask = frames.get(frame, "red_mask", lambda: _red_mask(
+            frame,
+            hsv=self._scratch("hsv", frame.shape[:2] + (3,)),
+            tmp=self._scratch("red_tmp", frame.shape[:2]),
+        ))
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            gray = gray[y0:y1, x0:x1]
+            mask = mask[y0:y1, x0:x1]
+        shape = gray.shape[:2]
+        masked = None
+        origin = (0, 0)
+        if cv2.countNonZero(mask) >= _MIN_RED_PIXELS:
+            x0, y0, cw, ch = _crop_rect(cv2.boundingRect(mask), shape, _RED_CROP_PAD, _RED_CROP_STEP)
+            rows, cols = slice(y0, y0 + ch), slice(x0, x0 + cw)
+            # The mask is strictly 0/255, so AND-ing with it zeroes everything else.
+            masked = cv2.bitwise_and(gray[rows, cols], mask[rows, cols], dst=self._scratch("masked", (ch, cw)))
+            origin = (x0, y0)
+        self._frame = frame
+        self._bounds = bounds
+        self._prepared = (gray, masked, origin)
+        return self._prepared
+
+    def _ocr_input(self, name: str, gray_like: np.ndarray, scale: float = 1.5, allow_native: bool = False) -> Tuple[np.ndarray, float]:
+        cached = self._inputs.get(name)
+        if cached is not None:
+            return cached
+        dst = None
+        if not (allow_native and gray_like.shape[0] >= _OCR_NATIVE_MIN_HEIGHT):
+            dst = self._scratch(name, _upscaled_shape(gray_like, scale))
+        self._inputs[name] = _upscale_for_ocr(gray_like, scale, allow_native, dst=dst)
+        return self._inputs[name]
+
+    def _passes(self, prepared: Tuple[np.ndarray, Optional[np.ndarray], Tuple[int, int]], oem: Optional[int]) -> Iterator[Tuple[Optional[dict], float, Tuple[int, int]]]:
+        """OCR data, scale and origin for the red pass (if any red), then the grayscale pass.
+
+        With parallel OCR the grayscale pass starts on the pool while the red
+        pass runs here. A caller that stops after a red hit closes the
+        generator, which cancels the grayscale pass if it has not started yet.
+        """
+        gray, masked, origin = prepared
+        gray_future: Optional[Future] = None
+        if masked is not None:
+            red_in, red_scale = self._ocr_input("ocr_red", masked)
+            if _OCR_PARALLEL:
+                gray_in, gray_scale = self._ocr_input("ocr_gray", gray, allow_native=_OCR_NATIVE_GRAY)
+                # A started job outlives cancel(), and the next frame reuses
+                # the "ocr_gray" scratch buffer; hand the pool its own copy.
+                gray_future = _ocr_executor().submit(_image_to_data, gray_in.copy(), _ALPHA_WHITELIST, oem)
             try:
-                conf_val = float(conf_str)
-            except Exception:
-                conf_val = 0.0
-            if conf_val < 0:
-                conf_val = 0.0
-            lefts = data.get("left", []); tops = data.get("top", []);
-            widths = data.get("width", []); heights = data.get("height", [])
-            if i >= len(lefts) or i >= len(tops) or i >= len(widths) or i >= len(heights):
-                continue
-            x = int(lefts[i] / scale)
-            y = int(tops[i] / scale)
-            w = int(widths[i] / scale)
-            h = int(heights[i] / scale)
-            if text == target.lower():
-                return Detection(True, (x, y, w, h), conf_val / 100.0, "ocr")
-            if target.lower() in text:
-                best_det = Detection(True, (x, y, w, h), conf_val / 100.0, "ocr_partial")
-        return best_det
-
-    # Pass 1: red mask (enemy nameplates like "Wendigo")
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    red_mask = _red_mask(bgr)
-    masked = cv2.bitwise_and(gray, gray, mask=red_mask)
-    det = _run_ocr(masked)
-    if det.found:
+                yield _image_to_data(red_in, _ALPHA_WHITELIST, oem), red_scale, origin
+            except GeneratorExit:
+                if gray_future is not None:
+                    gray_future.cancel()
+                raise
+        if gray_future is not None:
+            yield gray_future.result(), gray_scale, (0, 0)
+        else:
+            gray_in, gray_scale = self._ocr_input("ocr_gray", gray, allow_native=_OCR_NATIVE_GRAY)
+            yield _image_to_data(gray_in, _ALPHA_WHITELIST, oem), gray_scale, (0, 0)
+
+    def detect(self, bgr: np.ndarray, target: str = "wendigo", oem: Optional[int] = None) -> Detection:
+        """See ``detect_word_ocr``."""
+        # Ensure tesseract is configured; no-op if already set
+        configure_tesseract()
+        target_lc = target.lower()
+        key = self._result_key(bgr, None, "word", target_lc, oem)
+        # Copies, so callers may modify what they get back.
+        return replace(self._memo(key, lambda: self._detect(bgr, target_lc, oem)))
+
+    def _detect(self, bgr: np.ndarray, target_lc: str, oem: Optional[int]) -> Detection:
+        def _best(data: Optional[dict], scale: float, origin: Tuple[int, int]) -> Detection:
+            if data is None:
+                return Detection(False, method="ocr")
+            rows = _ocr_rows(data)
+            # First exact match wins; otherwise the last partial match.
+            hits = np.flatnonzero(rows.texts == target_lc)
+            method = "ocr"
+            if not hits.size:
+                hits = np.flatnonzero(_contains(rows.texts, target_lc))[::-1]
+                method = "ocr_partial"
+            if not hits.size:
+                return Detection(False, method="ocr")
+            box = tuple(_unscale_boxes(rows.boxes[hits[:1]], scale, origin)[0].tolist())
+            return Detection(True, box, float(rows.confs[hits[0]]) / 100.0, method)
+
+        # Pass 1: red mask (enemy nameplates like "Wendigo"); pass 2: general
+        # grayscale (white-on-dark UI like "Attack") when pass 1 finds nothing.
+        det = Detection(False, method="ocr")
+        for data, scale, origin in self._passes(self._prepare(bgr), oem):
+            det = _best(data, scale, origin)
+            if det.found:
+                break
         return det
-    # Pass 2: general grayscale (white-on-dark UI like "Attack")
-    return _run_ocr(gray)
 
+    def detect_multi(self, bgr: np.ndarray, target: str = "wendigo", oem: Optional[int] = None, roi_xywh: Optional[Tuple[int,int,int,int]] = None) -> Tuple[List[Tuple[int,int,int,int]], float]:
+        """See ``detect_word_ocr_multi``."""
+        return self.detect_many(bgr, (target,), oem, roi_xywh)[target]
 
-def detect_word_ocr_multi(bgr: np.ndarray, target: str = "wendigo") -> Tuple[List[Tuple[int,int,int,int]], float]:
-    """Return filtered boxes that match ``target`` via OCR with deduplication.
+    def detect_many(self, bgr: np.ndarray, targets: Sequence[str], oem: Optional[int] = None, roi_xywh: Optional[Tuple[int,int,int,int]] = None) -> Dict[str, Tuple[List[Tuple[int,int,int,int]], float]]:
+        """See ``detect_words_ocr_multi``."""
+        bounds = None
+        if roi_xywh is not None:
+            bounds = _roi_bounds(bgr.shape, roi_xywh)
+            x0, y0, x1, y1 = bounds
+            if x1 <= x0 or y1 <= y0:
+                return {t: ([], 0.0) for t in targets}
+        elif bgr.size == 0:
+            return {t: ([], 0.0) for t in targets}
+        targets_lc = tuple(dict.fromkeys(t.lower() for t in targets))
+        key = self._result_key(bgr, bounds, "words", targets_lc, oem)
+        found = self._memo(key, lambda: self._detect_many(bgr, targets_lc, oem, bounds))
+        out: Dict[str, Tuple[List[Tuple[int,int,int,int]], float]] = {}
+        for t in targets:
+            boxes, conf = found[t.lower()]
+            out[t] = (list(boxes), conf)
+        return out
 
-    Uses a two-pass strategy: red-mask first, then general grayscale fallback.
-    This enables detecting both red enemy nameplates (e.g., "Wendigo") and
-    white-on-dark UI text (e.g., "Attack").
+    def _detect_many(self, bgr: np.ndarray, targets_lc: Tuple[str, ...], oem: Optional[int], bounds: Optional[Tuple[int, int, int, int]]) -> Dict[str, Tuple[List[Tuple[int,int,int,int]], float]]:
+        ox, oy = bounds[:2] if bounds is not None else (0, 0)
+        results: Dict[str, Tuple[List[Tuple[int,int,int,int]], float]] = {t: ([], 0.0) for t in targets_lc}
+        pending = list(targets_lc)
+        # Pass 1: red mask; pass 2: general grayscale (captures white text
+        # like "Attack") for the targets pass 1 did not find. Every target
+        # is matched against the same OCR output of each pass.
+        for data, scale, origin in self._passes(self._prepare(bgr, bounds), oem):
+            if data is None:
+                continue
+            rows = _ocr_rows(data)
+            scaled = _unscale_boxes(rows.boxes, scale, origin)
+            valid = np.flatnonzero(_valid_text_boxes(scaled[:, 2], scaled[:, 3]))
+            texts = rows.texts[valid]
+            # With several targets, one joined string answers "is this target
+            # anywhere?" with a C substring scan and only targets that are
+            # present build a row mask. A single target goes straight to the
+            # mask, which is the same one scan.
+            joined = "\n".join(texts.tolist()) if len(pending) > 1 else None
+            missing = []
+            for target_lc in pending:
+                if not texts.size or (joined is not None and target_lc not in joined):
+                    missing.append(target_lc)
+                    continue
+                hit = valid[_contains(texts, target_lc)]
+                if not hit.size:
+                    missing.append(target_lc)
+                    continue
+                raw_boxes = [tuple(b) for b in scaled[hit].tolist()]
+                scores = (rows.confs[hit] / 100.0).tolist()
+                keep_indices = _nms(raw_boxes, scores, iou_thresh=0.5)
+                filtered_boxes = [raw_boxes[i] for i in keep_indices]
+                best_conf = max(scores[i] for i in keep_indices)
+                results[target_lc] = (_offset_boxes(filtered_boxes, ox, oy), best_conf)
+            pending = missing
+            if not pending:
+                break
+        return results
+
+
+class _FrameCache:
+    """Images derived from the most recently seen frame objects.
+
+    Several detectors run on the same captured frame (and on caller-made ROI
+    views of it) each tick, some of them on worker threads; keying on the
+    array object lets them all share its grayscale, red mask and edge maps.
+    Entries hold a strong reference to their array, so an id is never reused
+    while it is cached. Each image is computed once: a thread asking for one
+    that another thread is still computing waits for that result.
     """
-    def _collect_from(gray_like: np.ndarray, scale: float = 1.5) -> Tuple[List[Tuple[int,int,int,int]], List[float]]:
-        cfg = "--psm 6 -l eng -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-        resized = cv2.resize(gray_like, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+    _MAX_FRAMES = 4
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, Dict[str, object]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, bgr: np.ndarray, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        key = id(bgr)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not bgr:
+                entry = (bgr, {})
+                self._entries[key] = entry
+                while len(self._entries) > self._MAX_FRAMES:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            items = entry[1]
+            item = items.get(name)
+            if item is None:
+                pending: Future = Future()
+                items[name] = pending
+            elif isinstance(item, Future):
+                pending = None
+            else:
+                return item
+        if pending is None:
+            return item.result()
+        # Computed outside the lock so other frames and images are not held up.
         try:
-            data = pytesseract.image_to_data(resized, config=cfg, output_type=pytesseract.Output.DICT)
-        except Exception:
-            return [], []
-        boxes: List[Tuple[int,int,int,int]] = []
-        scores: List[float] = []
-        n = len(data.get("text", []))
-        for i in range(n):
-            text = (data["text"][i] or "").strip().lower()
-            if not text:
-                continue
-            conf_list = data.get("conf", [])
-            conf_str = conf_list[i] if i < len(conf_list) else "0"
-            try:
-                conf_val = float(conf_str)
-            except Exception:
-                conf_val = 0.0
-            if conf_val < 0:
-                conf_val = 0.0
-            lefts = data.get("left", []); tops = data.get("top", []);
-            widths = data.get("width", []); heights = data.get("height", [])
-            if i >= len(lefts) or i >= len(tops) or i >= len(widths) or i >= len(heights):
-                continue
-            x = int(lefts[i] / scale)
-            y = int(tops[i] / scale)
-            w = int(widths[i] / scale)
-            h = int(heights[i] / scale)
-            if not _is_valid_text_box(w, h):
-                continue
-            if text == target.lower() or target.lower() in text:
-                boxes.append((x, y, w, h))
-                scores.append(conf_val / 100.0)
-        return boxes, scores
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                items.pop(name, None)
+            pending.set_exception(exc)
+            raise
+        with self._lock:
+            items[name] = value
+        pending.set_result(value)
+        return value
 
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    # Pass 1: red mask
-    red_mask = _red_mask(bgr)
-    masked = cv2.bitwise_and(gray, gray, mask=red_mask)
-    raw_boxes1, scores1 = _collect_from(masked)
 
-    # If nothing found, pass 2: general grayscale (captures white text like "Attack")
-    raw_boxes2, scores2 = ([], [])
-    if not raw_boxes1:
-        raw_boxes2, scores2 = _collect_from(gray)
+_frame_images = _FrameCache()
+_thread_state = threading.local()
 
-    raw_boxes = raw_boxes1 + raw_boxes2
-    scores = scores1 + scores2
 
-    if raw_boxes and scores:
-        keep_indices = _nms(raw_boxes, scores, iou_thresh=0.5)
-        filtered_boxes = [raw_boxes[i] for i in keep_indices]
-        filtered_scores = [scores[i] for i in keep_indices]
-        best_conf = max(filtered_scores) if filtered_scores else 0.0
-        return filtered_boxes, best_conf
+def _frame_cache() -> _FrameCache:
+    return _frame_images
 
-    return [], 0.0
 
+def _word_detector() -> WordDetector:
+    det = getattr(_thread_state, "word_detector", None)
+    if det is None:
+        det = _thread_state.word_detector = WordDetector()
+    return det
 
-def _is_valid_text_box(width: int, height: int, min_size: int = 10, max_aspect: float = 8.0) -> bool:
-    """Filter out noise boxes based on size and aspect ratio."""
-    # Filter out boxes that are too small
-    if width < min_size or height < min_size:
-        return False
 
-    # Filter out boxes with extreme aspect ratios (too wide or too tall)
-    aspect_ratio = max(width, height) / min(width, height)
-    if aspect_ratio > max_aspect:
-        return False
+def detect_word_ocr(bgr: np.ndarray, target: str = "wendigo", oem: Optional[int] = None) -> Detection:
+    """OCR-based single best match for ``target``.
+
+    Tries a red-text focused pass first (for enemy nameplates),
+    then falls back to a general grayscale OCR pass to support
+    non-red UI elements like the "Attack" button. ``oem`` selects the
+    Tesseract engine (``None`` keeps the tesseract default).
+    """
+    return _word_detector().detect(bgr, target, oem)
+
+
+def detect_word_ocr_multi(bgr: np.ndarray, target: str = "wendigo", oem: Optional[int] = None, roi_xywh: Optional[Tuple[int,int,int,int]] = None) -> Tuple[List[Tuple[int,int,int,int]], float]:
+    """Return filtered boxes that match ``target`` via OCR with deduplication.
+
+    Uses a two-pass strategy: red-mask first, then general grayscale fallback.
+    This enables detecting both red enemy nameplates (e.g., "Wendigo") and
+    white-on-dark UI text (e.g., "Attack"). ``oem`` selects the Tesseract
+    engine (``None`` keeps the tesseract default). ``roi_xywh`` restricts the
+    search to that region of ``bgr``; boxes are still in ``bgr`` coordinates.
+    """
+    return _word_detector().detect_multi(bgr, target, oem, roi_xywh)
+
+
+def detect_words_ocr_multi(bgr: np.ndarray, targets: Sequence[str], oem: Optional[int] = None, roi_xywh: Optional[Tuple[int,int,int,int]] = None) -> Dict[str, Tuple[List[Tuple[int,int,int,int]], float]]:
+    """``detect_word_ocr_multi`` for several targets from one set of OCR passes.
+
+    Returns ``{target: (boxes, best_conf)}`` for every entry of ``targets``.
+    The grayscale pass runs only if some target is missing from the red pass.
+    """
+    return _word_detector().detect_many(bgr, targets, oem, roi_xywh)
+
+
+def _valid_text_boxes(widths: np.ndarray, heights: np.ndarray, min_size: int = 10, max_aspect: float = 8.0) -> np.ndarray:
+    """Mask of boxes that are plausible text, based on size and aspect ratio."""
+    # Filter out boxes that are too small
+    valid = (widths >= min_size) & (heights >= min_size)
 
     # Filter out boxes that are unreasonably large (likely false positives)
     max_dimension = 200  # pixels
-    if width > max_dimension or height > max_dimension:
-        return False
+    valid &= (widths <= max_dimension) & (heights <= max_dimension)
+
+    # Filter out boxes with extreme aspect ratios (too wide or too tall);
+    # compared without dividing, so zero sizes need no special case.
+    valid &= np.maximum(widths, heights) <= max_aspect * np.minimum(widths, heights)
+    return valid
 
-    return True
 
+# OpenCV's C++ NMS; missing from builds without the dnn module.
+_HAVE_DNN_NMS = hasattr(cv2, "dnn") and hasattr(cv2.dnn, "NMSBoxes")
+# NMSBoxes drops scores at or below its threshold; OCR confidences can be 0.
+_NMS_SCORE_FLOOR = float(np.finfo(np.float32).min)
 
-def _nms(boxes: List[Tuple[int,int,int,int]], scores: List[float], iou_thresh: float = 0.5) -> List[int]:
-    if not boxes:
+
+def _nms(boxes: Sequence[Tuple[int,int,int,int]] | np.ndarray, scores: Sequence[float] | np.ndarray, iou_thresh: float = 0.5) -> List[int]:
+    """Non-maximum suppression; returns kept indices, best score first.
+
+    ``boxes`` may be a list of x, y, w, h tuples or an (N, 4) array.
+    """
+    if len(boxes) == 0:
         return []
-    # Convert to [x1,y1,x2,y2]
-    x1 = np.array([b[0] for b in boxes], dtype=np.float32)
-    y1 = np.array([b[1] for b in boxes], dtype=np.float32)
-    x2 = np.array([b[0]+b[2] for b in boxes], dtype=np.float32)
-    y2 = np.array([b[1]+b[3] for b in boxes], dtype=np.float32)
-    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
-    order = np.argsort(-np.array(scores))
-    keep = []
-    while order.size > 0:
+    if _HAVE_DNN_NMS:
+        try:
+            # NMSBoxes treats w/h as exclusive extents; the other backends
+            # (and the original implementation) count (w+1)*(h+1) pixels, so
+            # widen by one to make every backend suppress the same boxes.
+            rects = np.asarray(boxes).reshape(-1, 4).astype(np.int32)
+            rects[:, 2:] += 1
+            rects = rects.tolist()
+            confs = np.asarray(scores, dtype=np.float32).ravel().tolist()
+            idx = cv2.dnn.NMSBoxes(rects, confs, _NMS_SCORE_FLOOR, float(iou_thresh))
+            return np.asarray(idx, dtype=np.intp).reshape(-1).tolist()
+        except cv2.error:
+            pass
+    if _nms_kernel is not None:
+        return _nms_numba(boxes, scores, iou_thresh)
+    return _nms_numpy(boxes, scores, iou_thresh)
+
+
+def _greedy_nms(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray, areas: np.ndarray, order: np.ndarray, iou_thresh: float) -> np.ndarray:
+    """Greedy NMS over boxes visited in ``order``; compiled by numba when installed."""
+    n = order.shape[0]
+    suppressed = np.zeros(n, dtype=np.bool_)
+    keep = np.empty(n, dtype=np.int64)
+    count = 0
+    for a in range(n):
+        if suppressed[a]:
+            continue
+        i = order[a]
+        keep[count] = i
+        count += 1
+        for b in range(a + 1, n):
+            if suppressed[b]:
+                continue
+            j = order[b]
+            iw = min(x2[i], x2[j]) - max(x1[i], x1[j]) + 1
+            ih = min(y2[i], y2[j]) - max(y1[i], y1[j]) + 1
+            if iw <= 0 or ih <= 0:
+                continue
+            inter = iw * ih
+            if inter > iou_thresh * (areas[i] + areas[j] - inter):
+                suppressed[b] = True
+    return keep[:count]
+
+
+_nms_kernel = njit(cache=True, nogil=True)(_greedy_nms) if njit is not None else None
+
+
+def _nms_numba(boxes: Sequence[Tuple[int,int,int,int]] | np.ndarray, scores: Sequence[float] | np.ndarray, iou_thresh: float = 0.5) -> List[int]:
+    """Exact greedy NMS through the numba kernel; no N x N temporaries."""
+    order = np.argsort(-np.asarray(scores, dtype=np.float32).ravel(), kind="stable")
+    x1, y1, bw, bh = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).T.copy()
+    x2 = x1 + bw
+    y2 = y1 + bh
+    areas = (bw + 1) * (bh + 1)
+    return _nms_kernel(x1, y1, x2, y2, areas, order, float(iou_thresh)).tolist()
+
+
+def _nms_numpy(boxes: Sequence[Tuple[int,int,int,int]] | np.ndarray, scores: Sequence[float] | np.ndarray, iou_thresh: float = 0.5) -> List[int]:
+    """Greedy NMS in numpy, used when neither ``cv2.dnn.NMSBoxes`` nor numba is available.
+
+    Same suppression as the other backends: each kept box drops the
+    remaining boxes it overlaps, with one vectorized IoU row per kept box.
+    """
+    order = np.argsort(-np.asarray(scores, dtype=np.float32).ravel(), kind="stable")
+    x1, y1, bw, bh = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).T.copy()
+    x2 = x1 + bw
+    y2 = y1 + bh
+    areas = (bw + 1) * (bh + 1)
+    keep: List[int] = []
+    while order.size:
         i = int(order[0])
         keep.append(i)
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
-        w = np.maximum(0.0, xx2 - xx1 + 1)
-        h = np.maximum(0.0, yy2 - yy1 + 1)
-        inter = w * h
-        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-6)
-        inds = np.where(iou <= iou_thresh)[0]
-        order = order[inds + 1]
+        rest = order[1:]
+        iw = np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]) + 1
+        ih = np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]) + 1
+        inter = np.maximum(iw, 0.0) * np.maximum(ih, 0.0)
+        # IoU > t  <=>  inter > t * union, which avoids the division.
+        union = (areas[i] + areas[rest] - inter).astype(np.float64)
+        order = rest[~(inter > iou_thresh * union)]
     return keep
 
 
-def detect_template_multi(bgr: np.ndarray, template_bgr: np.ndarray, threshold: float = 0.78, max_instances: int = 10) -> Tuple[List[Tuple[int,int,int,int]], List[float]]:
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    tpl_gray = cv2.cvtColor(template_bgr, cv2.COLOR_BGR2GRAY)
+# Coarse-to-fine matching: correlate at 1/4 resolution first, then refine at
+# full resolution only around coarse peaks within _PYRAMID_MARGIN of the
+# threshold. Templates smaller than _PYRAMID_MIN_TEMPLATE px on a side lose
+# too much detail when downsampled and are matched directly.
+_PYRAMID_LEVELS = 2
+_PYRAMID_MIN_TEMPLATE = 32
+_PYRAMID_MARGIN = 0.1
+# Thin Canny edges blur away under pyrDown, so edge maps get a wider margin.
+_EDGE_PYRAMID_MARGIN = 0.2
 
-    candidates: List[Tuple[int, int, int, int]] = []
-    candidate_scores: List[float] = []
+
+# OpenCL (T-API) correlation for large inputs when a device is available.
+# Small windows stay on the CPU where upload/download would dominate.
+# BSBOT_OPENCL=0 disables the GPU path entirely.
+_USE_OPENCL = os.environ.get("BSBOT_OPENCL", "1") != "0"
+_OPENCL_MIN_PIXELS = 640 * 360
+_opencl_ready: Optional[bool] = None
+
+
+def _opencl_enabled() -> bool:
+    global _opencl_ready
+    if _opencl_ready is None:
+        try:
+            _opencl_ready = _USE_OPENCL and bool(cv2.ocl.haveOpenCL())
+            if _opencl_ready:
+                cv2.ocl.setUseOpenCL(True)
+        except Exception:
+            _opencl_ready = False
+    return _opencl_ready
+
+
+def _correlate(image: np.ndarray, tpl: np.ndarray) -> np.ndarray:
+    if image.shape[0] * image.shape[1] >= _OPENCL_MIN_PIXELS and _opencl_enabled():
+        try:
+            return cv2.matchTemplate(cv2.UMat(image), cv2.UMat(tpl), cv2.TM_CCOEFF_NORMED).get()
+        except cv2.error:
+            pass
+    return cv2.matchTemplate(image, tpl, cv2.TM_CCOEFF_NORMED)
+
+
+def _pyramid_down(img: np.ndarray) -> np.ndarray:
+    for _ in range(_PYRAMID_LEVELS):
+        img = cv2.pyrDown(img)
+    return img
+
+
+def _match_template(image: np.ndarray, tpl: np.ndarray, threshold: float, margin: float = _PYRAMID_MARGIN, tpl_small: Optional[np.ndarray] = None, image_small: Optional[Callable[[], np.ndarray]] = None) -> np.ndarray:
+    """``cv2.matchTemplate`` (``TM_CCOEFF_NORMED``) evaluated coarse-to-fine.
+
+    The returned map has the full-resolution result shape; positions outside
+    the refined windows hold the coarse maximum, capped below
+    ``threshold - margin`` so they never count as hits but a miss still
+    reports a real best correlation. ``tpl_small`` is the template already
+    reduced by ``_pyramid_down``, when the caller has it cached;
+    ``image_small`` returns the reduced image, so callers matching several
+    templates against one frame build its pyramid once.
+    """
+    th, tw = tpl.shape[:2]
+    ih, iw = image.shape[:2]
+    if min(th, tw) < _PYRAMID_MIN_TEMPLATE or ih < 2 * th or iw < 2 * tw:
+        return _correlate(image, tpl)
+
+    if tpl_small is None:
+        tpl_small = _pyramid_down(tpl)
+    coarse = _correlate(image_small() if image_small is not None else _pyramid_down(image), tpl_small)
+
+    fill = min(float(coarse.max()), threshold - margin)
+    res = np.full((ih - th + 1, iw - tw + 1), fill, dtype=np.float32)
+    peaks = (coarse >= threshold - margin).astype(np.uint8)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(peaks, connectivity=8)
+    factor = 1 << _PYRAMID_LEVELS
+    for x, y, w, h, _area in stats[1:]:
+        # Result positions to refine, padded by one coarse cell on each side.
+        rx0 = max(0, (x - 1) * factor)
+        ry0 = max(0, (y - 1) * factor)
+        rx1 = min(res.shape[1], (x + w + 1) * factor)
+        ry1 = min(res.shape[0], (y + h + 1) * factor)
+        if rx1 <= rx0 or ry1 <= ry0:
+            continue
+        window = image[ry0:ry1 + th - 1, rx0:rx1 + tw - 1]
+        res[ry0:ry1, rx0:rx1] = _correlate(window, tpl)
+    return res
+
+
+@dataclass
+class _PreparedTemplate:
+    gray: np.ndarray
+    edges: np.ndarray
+    gray_small: np.ndarray
+    edges_small: np.ndarray
+
+
+_TEMPLATE_CACHE_SIZE = 8
+_template_cache: "OrderedDict[Tuple[int, int], Tuple[weakref.ref, _PreparedTemplate]]" = OrderedDict()
+_template_cache_lock = threading.Lock()
+
+
+def _prep_template(template_bgr: np.ndarray, downscale: int = 1) -> _PreparedTemplate:
+    """Grayscale, Canny and pyramid versions of a template, cached per array.
+
+    ``downscale`` > 1 prepares the template shrunk by that factor. Entries are
+    keyed by ``id`` and validated through a weak reference, so a new array
+    that reuses a freed id never gets stale data.
+    """
+    key = (id(template_bgr), downscale)
+    with _template_cache_lock:
+        entry = _template_cache.get(key)
+        if entry is not None and entry[0]() is template_bgr:
+            _template_cache.move_to_end(key)
+            return entry[1]
+    gray = _shrink(cv2.cvtColor(template_bgr, cv2.COLOR_BGR2GRAY), downscale)
+    edges = cv2.Canny(gray, 80, 160)
+    prepared = _PreparedTemplate(gray, edges, _pyramid_down(gray), _pyramid_down(edges))
+    with _template_cache_lock:
+        _template_cache[key] = (weakref.ref(template_bgr), prepared)
+        while len(_template_cache) > _TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    return prepared
+
+
+def _shrink(gray: np.ndarray, factor: int) -> np.ndarray:
+    if factor <= 1:
+        return gray
+    h, w = gray.shape[:2]
+    return cv2.resize(gray, (max(1, w // factor), max(1, h // factor)), interpolation=cv2.INTER_AREA)
+
+
+_PEAK_KERNEL = np.ones((3, 3), dtype=np.uint8)
+
+# Grayscale scores this far above the threshold make the edge pass redundant.
+_EDGE_PASS_MARGIN = 0.12
+
+
+# Template results keyed by the exact pixels of the searched region, so an
+# idle screen (menu or panel unchanged since the last poll) skips matching.
+_TEMPLATE_RESULT_CACHE_SIZE = 32
+_template_results: "OrderedDict[Tuple, Tuple[weakref.ref, Tuple[List[Tuple[int,int,int,int]], List[float]]]]" = OrderedDict()
+_template_results_lock = threading.Lock()
+
+
+def detect_template_multi(bgr: np.ndarray, template_bgr: np.ndarray, threshold: float = 0.78, max_instances: int = 10, roi_xywh: Optional[Tuple[int,int,int,int]] = None, match_downscale: int = 1) -> Tuple[List[Tuple[int,int,int,int]], List[float]]:
+    """Template matches above ``threshold`` (grayscale, then edges), after NMS.
+
+    ``roi_xywh`` restricts matching to that region of ``bgr``; boxes are still
+    returned in ``bgr`` coordinates. ``match_downscale`` > 1 matches the frame
+    and template shrunk by that factor (``INTER_AREA``), cutting correlation
+    cost by roughly its fourth power at the price of localisation accuracy;
+    boxes are scaled back to full resolution. Results are cached by the
+    content of the searched region when ``xxhash`` is available.
+    """
+    k = max(1, int(match_downscale))
+    if not _RESULT_CACHE:
+        return _detect_template_multi(bgr, template_bgr, threshold, max_instances, roi_xywh, k)
+    bounds = _roi_bounds(bgr.shape, roi_xywh) if roi_xywh is not None else None
+    region = bgr if bounds is None else bgr[bounds[1]:bounds[3], bounds[0]:bounds[2]]
+    key = (_image_digest(region), bgr.shape, bounds, id(template_bgr), threshold, max_instances, k)
+    with _template_results_lock:
+        entry = _template_results.get(key)
+        if entry is not None and entry[0]() is template_bgr:
+            _template_results.move_to_end(key)
+            boxes, scores = entry[1]
+            return list(boxes), list(scores)
+    boxes, scores = _detect_template_multi(bgr, template_bgr, threshold, max_instances, roi_xywh, k)
+    with _template_results_lock:
+        _template_results[key] = (weakref.ref(template_bgr), (list(boxes), list(scores)))
+        while len(_template_results) > _TEMPLATE_RESULT_CACHE_SIZE:
+            _template_results.popitem(last=False)
+    return boxes, scores
+
+
+def _detect_template_multi(bgr: np.ndarray, template_bgr: np.ndarray, threshold: float, max_instances: int, roi_xywh: Optional[Tuple[int,int,int,int]], k: int) -> Tuple[List[Tuple[int,int,int,int]], List[float]]:
+    suffix = f"/{k}" if k > 1 else ""
+    frames = _frame_cache()
+    full_gray = frames.get(bgr, "gray", lambda: cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+    gray = frames.get(bgr, "gray" + suffix, lambda: _shrink(full_gray, k))
+    ox, oy = 0, 0
+    if roi_xywh is not None:
+        x0, y0, x1, y1 = _roi_bounds(bgr.shape, roi_xywh)
+        gray = gray[y0 // k:y1 // k, x0 // k:x1 // k]
+        ox, oy = (x0 // k) * k, (y0 // k) * k
+    tpl = _prep_template(template_bgr, k)
+    th, tw = tpl.gray.shape[:2]
+    if gray.shape[0] < th or gray.shape[1] < tw:
+        return [], []
+
+    cand_boxes: List[np.ndarray] = []
+    cand_scores: List[np.ndarray] = []
 
     def _collect(res: np.ndarray, tpl_shape: Tuple[int, int]) -> None:
         if res is None:
             return
-        ys, xs = np.where(res >= threshold)
-        h, w = tpl_shape
-        for y, x in zip(ys, xs):
-            candidates.append((int(x), int(y), int(w), int(h)))
-            candidate_scores.append(float(res[y, x]))
+        above = res >= threshold
+        if not above.any():
+            return
+        # Only 3x3 local maxima can survive NMS: a shifted neighbour of a
+        # stronger peak overlaps it almost entirely.
+        above &= res >= cv2.dilate(res, _PEAK_KERNEL)
+        ys, xs = np.nonzero(above)
+        boxes = np.empty((xs.size, 4), dtype=np.int32)
+        boxes[:, 0] = xs
+        boxes[:, 1] = ys
+        boxes[:, 2] = tpl_shape[1]
+        boxes[:, 3] = tpl_shape[0]
+        cand_boxes.append(boxes)
+        # Boolean indexing visits hits in the same row-major order as nonzero.
+        cand_scores.append(res[above].astype(np.float32, copy=False))
+
+    # Reduced frames for the coarse pass are shared with other templates
+    # matched against this frame; ROI slices build their own.
+    gray_small = edges_small = None
+    if roi_xywh is None:
+        gray_small = lambda: frames.get(bgr, "gray_small" + suffix, lambda: _pyramid_down(gray))
+        edges_small = lambda: frames.get(bgr, "edges_small" + suffix, lambda: _pyramid_down(edges))
 
     # Raw grayscale correlation
-    res_gray = cv2.matchTemplate(gray, tpl_gray, cv2.TM_CCOEFF_NORMED)
-    _collect(res_gray, tpl_gray.shape[:2])
+    res_gray = _match_template(gray, tpl.gray, threshold, tpl_small=tpl.gray_small, image_small=gray_small)
+    _collect(res_gray, tpl.gray.shape[:2])
 
-    # Edge-based correlation (helps with stronger outline matches)
-    edges = cv2.Canny(gray, 80, 160)
-    tpl_edges = cv2.Canny(tpl_gray, 80, 160)
-    res_edges = cv2.matchTemplate(edges, tpl_edges, cv2.TM_CCOEFF_NORMED)
-    _collect(res_edges, tpl_edges.shape[:2])
+    # Edge-based correlation (helps with stronger outline matches). Redundant
+    # when the grayscale pass already has a clearly confident hit.
+    if float(res_gray.max()) < threshold + _EDGE_PASS_MARGIN:
+        if roi_xywh is None:
+            edges = frames.get(bgr, "edges" + suffix, lambda: cv2.Canny(gray, 80, 160))
+        else:
+            edges = cv2.Canny(gray, 80, 160)
+        res_edges = _match_template(edges, tpl.edges, threshold, margin=_EDGE_PYRAMID_MARGIN, tpl_small=tpl.edges_small, image_small=edges_small)
+        _collect(res_edges, tpl.edges.shape[:2])
 
-    if not candidates:
+    if not cand_boxes:
         return [], []
 
-    keep = _nms(candidates, candidate_scores, iou_thresh=0.5)
-    boxes = [candidates[i] for i in keep][:max_instances]
-    scores = [candidate_scores[i] for i in keep][:max_instances]
+    candidates = np.concatenate(cand_boxes)
+    candidate_scores = np.concatenate(cand_scores)
+    keep = _nms(candidates, candidate_scores, iou_thresh=0.5)[:max_instances]
+    candidates *= k
+    candidates[:, 0] += ox
+    candidates[:, 1] += oy
+    boxes = [tuple(b) for b in candidates[keep].tolist()]
+    scores = candidate_scores[keep].tolist()
     return boxes, scores
 
 
-def detect_digits_ocr_multi(bgr: np.ndarray, targets: List[str] | Tuple[str, ...] = ("1",)) -> Tuple[List[Tuple[int,int,int,int]], float]:
+def detect_digits_ocr_multi(bgr: np.ndarray, targets: List[str] | Tuple[str, ...] = ("1",), roi_xywh: Optional[Tuple[int,int,int,int]] = None) -> Tuple[List[Tuple[int,int,int,int]], float]:
     """Detect one or more digit tokens via OCR within a region.
 
     - Restricts OCR to digits for better precision.
     - Returns deduplicated boxes and best confidence.
+    - ``roi_xywh`` limits OCR to that region; boxes stay in ``bgr`` coordinates.
     """
     configure_tesseract()
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    scale = 1.5
-    resized = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-    cfg = "--psm 6 -l eng -c tessedit_char_whitelist=0123456789"
-    try:
-        data = pytesseract.image_to_data(resized, config=cfg, output_type=pytesseract.Output.DICT)
-    except Exception:
+    gray = _frame_cache().get(bgr, "gray", lambda: cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+    gray, ox, oy = _roi_view(gray, roi_xywh)
+    if gray.size == 0:
+        return [], 0.0
+    resized, scale = _upscale_for_ocr(gray, 1.5, allow_native=_OCR_NATIVE_GRAY)
+    data = _image_to_data(resized, _DIGIT_WHITELIST, _DIGIT_OCR_OEM)
+    if data is None:
         return [], 0.0
 
-    targets_lc = {t.lower() for t in targets}
-    raw_boxes: List[Tuple[int,int,int,int]] = []
-    scores: List[float] = []
-    n = len(data.get("text", []))
-    for i in range(n):
-        text = (data["text"][i] or "").strip().lower()
-        if not text:
-            continue
-        if text not in targets_lc:
-            continue
-        conf_list = data.get("conf", [])
-        conf_str = conf_list[i] if i < len(conf_list) else "0"
-        try:
-            conf_val = float(conf_str)
-        except Exception:
-            conf_val = 0.0
-        if conf_val < 0:
-            conf_val = 0.0
-        lefts = data.get("left", []); tops = data.get("top", []);
-        widths = data.get("width", []); heights = data.get("height", [])
-        if i >= len(lefts) or i >= len(tops) or i >= len(widths) or i >= len(heights):
-            continue
-        x = int(lefts[i] / scale)
-        y = int(tops[i] / scale)
-        w = int(widths[i] / scale)
-        h = int(heights[i] / scale)
-        if not _is_valid_text_box(w, h):
-            continue
-        raw_boxes.append((x, y, w, h))
-        scores.append(conf_val / 100.0)
+    rows = _ocr_rows(data)
+    scaled = _unscale_boxes(rows.boxes, scale, (0, 0))
+    hit = np.isin(rows.texts, [t.lower() for t in targets]) & _valid_text_boxes(scaled[:, 2], scaled[:, 3])
+    raw_boxes = [tuple(b) for b in scaled[hit].tolist()]
+    scores = (rows.confs[hit] / 100.0).tolist()
 
     if raw_boxes and scores:
         keep_indices = _nms(raw_boxes, scores, iou_thresh=0.5)
         filtered_boxes = [raw_boxes[i] for i in keep_indices]
         filtered_scores = [scores[i] for i in keep_indices]
         best_conf = max(filtered_scores) if filtered_scores else 0.0
-        return filtered_boxes, best_conf
+        return _offset_boxes(filtered_boxes, ox, oy), best_conf
 
     return [], 0.0
 
 
 def detect_with_template(bgr: np.ndarray, template_bgr: np.ndarray, threshold: float = 0.78) -> Detection:
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    tpl_gray = cv2.cvtColor(template_bgr, cv2.COLOR_BGR2GRAY)
-    edges = cv2.Canny(gray, 80, 160)
-    tpl_edges = cv2.Canny(tpl_gray, 80, 160)
-    res = cv2.matchTemplate(edges, tpl_edges, cv2.TM_CCOEFF_NORMED)
+    frames = _frame_cache()
+    gray = frames.get(bgr, "gray", lambda: cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+    tpl = _prep_template(template_bgr)
+    edges = frames.get(bgr, "edges", lambda: cv2.Canny(gray, 80, 160))
+    res = _match_template(
+        edges, tpl.edges, threshold, margin=_EDGE_PYRAMID_MARGIN, tpl_small=tpl.edges_small,
+        image_small=lambda: frames.get(bgr, "edges_small", lambda: _pyramid_down(edges)),
+    )
     min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-    h, w = tpl_edges.shape[:2]
+    h, w = tpl.edges.shape[:2]
     if max_val >= threshold:
         x, y = max_loc
         return Detection(True, (x, y, w, h), float(max_val), "template")
@@ -341,9 +1215,10 @@ def detect_with_template(bgr: np.ndarray, template_bgr: np.ndarray, threshold: f
 
 
 def derive_hitbox_from_word(word_bbox: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
-    x, y, w, h = word_bbox
+    x, y, w, h = (int(v) for v in word_bbox)
     cx = x + w // 2
-    hy = int(y + h + 1.4 * h)
-    hw = int(0.9 * w)
-    hh = int(0.7 * h)
-    return int(cx - hw // 2), int(hy - hh // 2), hw, hh
+    # Integer forms of 1.4*h below the word, 0.9*w wide and 0.7*h tall.
+    hy = y + h + (7 * h) // 5
+    hw = (9 * w) // 10
+    hh = (7 * h) // 10
+    return cx - hw // 2, hy - hh // 2, hw, hh
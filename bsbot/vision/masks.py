@@ -0,0 +1,39 @@
+"""Color masks shared by the detectors and the template tools."""
+from __future__ import annotations
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Nameplate red: hue 0-10 or 170-180 (OpenCV's 0-180 scale), S and V >= 120.
+# The wrapped hue range is a 256-entry lookup on the hue plane; saturation
+# and value share one inRange over the HSV image.
+_RED_HUE_LUT = np.zeros(256, dtype=np.uint8)
+_RED_HUE_LUT[0:11] = 255
+_RED_HUE_LUT[170:181] = 255
+_RED_SV_LOWER = np.array([0, 120, 120], dtype=np.uint8)
+_RED_SV_UPPER = np.array([255, 255, 255], dtype=np.uint8)
+_K3 = np.ones((3, 3), dtype=np.uint8)
+
+
+def red_mask(
+    bgr: np.ndarray,
+    hsv: Optional[np.ndarray] = None,
+    tmp: Optional[np.ndarray] = None,
+    dst: Optional[np.ndarray] = None,
+    open_speckle: bool = False,
+) -> np.ndarray:
+    """Binary (0/255) mask of nameplate red; optional buffers avoid per-call allocation.
+
+    Speckle is cleaned with a 3x3 median, which keeps 1-2 px text strokes;
+    ``open_speckle`` uses a cheaper 3x3 opening that can erase them.
+    """
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=hsv)
+    hue = cv2.extractChannel(hsv, 0, dst=tmp)
+    m1 = cv2.LUT(hue, _RED_HUE_LUT, dst=hue)
+    m2 = cv2.inRange(hsv, _RED_SV_LOWER, _RED_SV_UPPER, dst=dst)
+    mask = cv2.bitwise_and(m1, m2, dst=m1)
+    if open_speckle:
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, _K3, dst=m2)
+    return cv2.medianBlur(mask, 3, dst=m2)
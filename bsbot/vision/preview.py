@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Optional
+import threading
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TJSAMP_420, TurboJPEG
+except ImportError:  # optional: previews are encoded with cv2.imencode
+    TurboJPEG = None
+
+
+_tj: Optional["TurboJPEG"] = None
+_tj_failed = False
+_tj_lock = threading.Lock()
+
+
+def _turbojpeg() -> Optional["TurboJPEG"]:
+    """Shared encoder, or ``None`` if PyTurboJPEG or libturbojpeg is missing."""
+    global _tj, _tj_failed
+    if TurboJPEG is None or _tj_failed:
+        return None
+    with _tj_lock:
+        if _tj is None and not _tj_failed:
+            try:
+                _tj = TurboJPEG()
+            except Exception:  # the wrapper is installed but the library is not
+                _tj_failed = True
+        return _tj
+
+
+def encode_jpeg(img: np.ndarray, quality: int = 70) -> Optional[bytes]:
+    """JPEG bytes of a BGR preview image, or ``None`` if encoding fails.
+
+    Uses libjpeg-turbo through PyTurboJPEG when available (4:2:0 chroma, as
+    ``cv2.imencode`` writes by default), else ``cv2.imencode``.
+    """
+    tj = _turbojpeg()
+    if tj is not None:
+        try:
+            return tj.encode(img, quality=quality, jpeg_subsample=TJSAMP_420)
+        except Exception:
+            pass
+    ok, jpg = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return jpg.tobytes() if ok else None
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import os
+import threading
 
 import cv2
 import numpy as np
 
+# Same hue-LUT red mask the OCR nameplate pass uses: one HSV conversion, a
+# table lookup on the hue plane and one S/V range test.
+from bsbot.vision.masks import red_mask
+
+# 3x3 rectangle that joins a word's characters into one blob; built once.
+_JOIN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
 
 @dataclass
 class TemplateResult:
@@ -16,50 +24,29 @@ class TemplateResult:
     reason: str = ""
 
 
-def _red_mask(bgr: np.ndarray) -> np.ndarray:
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-    lower1 = np.array([0, 120, 120], dtype=np.uint8)
-    upper1 = np.array([10, 255, 255], dtype=np.uint8)
-    lower2 = np.array([170, 120, 120], dtype=np.uint8)
-    upper2 = np.array([180, 255, 255], dtype=np.uint8)
-    m1 = cv2.inRange(hsv, lower1, upper1)
-    m2 = cv2.inRange(hsv, lower2, upper2)
-    mask = cv2.bitwise_or(m1, m2)
-    mask = cv2.medianBlur(mask, 3)
-    return mask
-
-
 def extract_red_word_template(bgr: np.ndarray) -> TemplateResult:
     """Try to extract a red word-like region (e.g., Wendigo) from a full screenshot.
 
     Heuristic-based: finds connected components on a red hue mask, keeps the
     widest component with text-like aspect ratio and reasonable size.
     """
-    mask = _red_mask(bgr)
+    mask = red_mask(bgr)
     # Morph to join characters
-    kernel = np.ones((3, 3), np.uint8)
-    mask = cv2.dilate(mask, kernel, iterations=1)
-
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    cand = None
-    best_score = -1.0
-    for c in contours:
-        x, y, w, h = cv2.boundingRect(c)
-        area = w * h
-        if area < 200:  # ignore tiny noise
-            continue
-        ar = w / max(1, h)
-        # Word-like aspect ratio and size gate
-        if 2.2 <= ar <= 10.0 and 14 <= h <= 120:
-            score = area * ar  # prefer wider/clearer candidates
-            if score > best_score:
-                best_score = score
-                cand = (x, y, w, h)
-
-    if not cand:
+    cv2.dilate(mask, _JOIN_KERNEL, dst=mask, iterations=1)
+
+    # Bounding boxes of all blobs in one call; row 0 is the background.
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    xs, ys, ws, hs = (stats[1:, i].astype(np.int64) for i in (cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT))
+    area = ws * hs
+    ar = ws / np.maximum(hs, 1)
+    # Ignore tiny noise; keep word-like aspect ratios and sizes
+    ok = (area >= 200) & (ar >= 2.2) & (ar <= 10.0) & (hs >= 14) & (hs <= 120)
+    if not ok.any():
         return TemplateResult(False, reason="no suitable red word region found")
 
-    x, y, w, h = cand
+    score = np.where(ok, area * ar, -1.0)  # prefer wider/clearer candidates
+    best = int(np.argmax(score))
+    x, y, w, h = int(xs[best]), int(ys[best]), int(ws[best]), int(hs[best])
     pad_x = max(2, int(0.06 * w))
     pad_y = max(2, int(0.2 * h))
     x0 = max(0, x - pad_x)
@@ -70,6 +57,36 @@ def extract_red_word_template(bgr: np.ndarray) -> TemplateResult:
     return TemplateResult(True, (x0, y0, x1 - x0, y1 - y0), crop, "heuristic-red")
 
 
+_loaded: Dict[str, Tuple[Tuple[int, int], np.ndarray]] = {}
+_loaded_lock = threading.Lock()
+
+
+def load_template(path: str) -> Optional[np.ndarray]:
+    """Read a BGR template image, decoding it again only when the file changes.
+
+    Entries are keyed by path and checked against the file's mtime and size.
+    The same array is returned while the file is unchanged, which also lets
+    the detector's per-template caches (keyed by array identity) hit across
+    frames; treat it as read-only. Returns ``None`` if the file is missing or
+    unreadable.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _loaded_lock:
+        cached = _loaded.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    with _loaded_lock:
+        _loaded[path] = (stamp, img)
+    return img
+
+
 def save_template(img: np.ndarray, out_path: str) -> None:
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     cv2.imwrite(out_path, img)
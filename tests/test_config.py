@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from bsbot.core.config import Config
+
+
+class ProfileListingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.monsters = Path(tmp.name) / "monsters"
+        self.monsters.mkdir()
+        self.config = Config(tmp.name)
+
+    def _write(self, name: str, text: str) -> None:
+        path = self.monsters / name
+        path.write_text(text, encoding="utf-8")
+        # Force a visible change even on filesystems with coarse timestamps.
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_in_place_edit_is_picked_up(self) -> None:
+        self._write("wendigo.yml", "id: wendigo\nname: Wendigo\n")
+        self.assertEqual(self.config.list_monster_profiles(), [{"id": "wendigo", "name": "Wendigo"}])
+        self._write("wendigo.yml", "id: wendigo\nname: Frost Wendigo\n")
+        self.assertEqual(self.config.list_monster_profiles(), [{"id": "wendigo", "name": "Frost Wendigo"}])
+        self.assertEqual(self.config.load_monster_profile("wendigo")["name"], "Frost Wendigo")
+
+    def test_added_profile_is_listed(self) -> None:
+        self._write("a.yml", "name: A\n")
+        self.assertEqual(len(self.config.list_monster_profiles()), 1)
+        self._write("b.yml", "name: B\n")
+        self.assertEqual([p["id"] for p in self.config.list_monster_profiles()], ["a", "b"])
+
+    def test_unchanged_listing_is_reused(self) -> None:
+        self._write("a.yml", "name: A\n")
+        first = self.config.list_monster_profiles()
+        first.append({"id": "x"})  # callers get copies
+        self.assertEqual(self.config.list_monster_profiles(), [{"id": "a", "name": "A"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
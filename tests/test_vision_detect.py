@@ -0,0 +1,329 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+try:
+    import numpy as np
+    from bsbot.vision import detect
+except ImportError:  # OpenCV / Tesseract bindings not installed
+    detect = None
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class NmsTests(unittest.TestCase):
+    def test_overlapping_boxes_collapse_to_best(self) -> None:
+        boxes = [(10, 10, 20, 20), (11, 11, 20, 20), (100, 100, 20, 20)]
+        scores = [0.8, 0.9, 0.7]
+        self.assertEqual(detect._nms(boxes, scores, iou_thresh=0.5), [1, 2])
+
+    def test_accepts_arrays(self) -> None:
+        boxes = np.array([[0, 0, 10, 10], [1, 0, 10, 10], [50, 50, 10, 10]], dtype=np.int64)
+        scores = np.array([0.5, 0.6, 0.9], dtype=np.float32)
+        self.assertEqual(detect._nms(boxes, scores), [2, 1])
+
+    def test_empty(self) -> None:
+        self.assertEqual(detect._nms([], []), [])
+        self.assertEqual(detect._nms(np.zeros((0, 4)), np.zeros(0)), [])
+
+    def test_zero_scores_are_kept(self) -> None:
+        self.assertEqual(sorted(detect._nms([(0, 0, 10, 10), (50, 50, 10, 10)], [0.0, 0.0])), [0, 1])
+
+    def test_numpy_fallback_matches(self) -> None:
+        boxes = [(10, 10, 20, 20), (11, 11, 20, 20), (100, 100, 20, 20)]
+        scores = [0.8, 0.9, 0.7]
+        self.assertEqual(detect._nms_numpy(boxes, scores), detect._nms(boxes, scores))
+
+    def test_backends_share_inclusive_area(self) -> None:
+        # IoU is 0.333 with w*h areas but 0.375 with (w+1)*(h+1); every
+        # backend must use the latter and suppress the second box.
+        boxes = [(0, 0, 10, 10), (5, 0, 10, 10)]
+        scores = [0.9, 0.8]
+        self.assertEqual(detect._nms(boxes, scores, iou_thresh=0.35), [0])
+        self.assertEqual(detect._nms_numpy(boxes, scores, iou_thresh=0.35), [0])
+
+    def test_backends_agree_on_dense_clusters(self) -> None:
+        rng = np.random.default_rng(3)
+        centers = rng.integers(0, 200, size=(6, 2))
+        xy = np.repeat(centers, 40, axis=0) + rng.integers(-8, 9, size=(240, 2))
+        wh = rng.integers(18, 30, size=(240, 2))
+        boxes = np.concatenate([xy, wh], axis=1).astype(np.int32)
+        scores = rng.permutation(240).astype(np.float32) / 240
+        x1, y1, w, h = boxes.astype(np.float32).T
+        order = np.argsort(-scores, kind="stable")
+        greedy = detect._greedy_nms(x1, y1, x1 + w, y1 + h, (w + 1) * (h + 1), order, 0.5).tolist()
+        self.assertEqual(detect._nms_numpy(boxes, scores, 0.5), greedy)
+        self.assertEqual(detect._nms(boxes, scores, 0.5), greedy)
+        if detect._nms_kernel is not None:
+            self.assertEqual(detect._nms_numba(boxes, scores, 0.5), greedy)
+
+    def test_greedy_kernel_matches(self) -> None:
+        boxes = np.array([[10, 10, 20, 20], [11, 11, 20, 20], [100, 100, 20, 20]], dtype=np.float32)
+        x1, y1, w, h = boxes.T
+        order = np.array([1, 0, 2])
+        keep = detect._greedy_nms(x1, y1, x1 + w, y1 + h, (w + 1) * (h + 1), order, 0.5)
+        self.assertEqual(keep.tolist(), [1, 2])
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class OcrRowsTests(unittest.TestCase):
+    def test_filters_empty_text_and_parses_conf(self) -> None:
+        data = {
+            "text": ["", " Wendigo ", "Attack", None],
+            "conf": ["-1", "91.5", "oops", "-1"],
+            "left": [0, 30, 60, 90],
+            "top": [0, 10, 20, 30],
+            "width": [100, 40, 50, 60],
+            "height": [100, 12, 14, 16],
+        }
+        rows = detect._ocr_rows(data)
+        self.assertEqual(rows.texts.tolist(), ["wendigo", "attack"])
+        self.assertEqual(rows.confs.tolist(), [91.5, 0.0])
+        self.assertEqual(rows.boxes.tolist(), [[30, 10, 40, 12], [60, 20, 50, 14]])
+
+    def test_drops_rows_without_complete_box(self) -> None:
+        data = {"text": ["one", "two"], "conf": [90], "left": [1, 2], "top": [1, 2], "width": [5], "height": [5, 6]}
+        texts, confs, boxes = detect._ocr_rows(data)
+        self.assertEqual(texts.tolist(), ["one"])
+        self.assertEqual(confs.tolist(), [90.0])
+        self.assertEqual(boxes.shape, (1, 4))
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class ValidTextBoxTests(unittest.TestCase):
+    def test_size_and_aspect_limits(self) -> None:
+        widths = np.array([9, 40, 81, 80, 201, 0])
+        heights = np.array([20, 12, 10, 10, 30, 0])
+        self.assertEqual(detect._valid_text_boxes(widths, heights).tolist(), [False, True, False, True, False, False])
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class RedMaskTests(unittest.TestCase):
+    def test_matches_two_range_definition(self) -> None:
+        rng = np.random.default_rng(0)
+        bgr = rng.integers(0, 256, size=(40, 60, 3), dtype=np.uint8)
+        hsv = detect.cv2.cvtColor(bgr, detect.cv2.COLOR_BGR2HSV)
+        m1 = detect.cv2.inRange(hsv, np.array([0, 120, 120]), np.array([10, 255, 255]))
+        m2 = detect.cv2.inRange(hsv, np.array([170, 120, 120]), np.array([180, 255, 255]))
+        expected = detect.cv2.medianBlur(detect.cv2.bitwise_or(m1, m2), 3)
+        np.testing.assert_array_equal(detect._red_mask(bgr), expected)
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class CropRectTests(unittest.TestCase):
+    def test_pads_and_rounds_up(self) -> None:
+        self.assertEqual(detect._crop_rect((100, 50, 40, 10), (480, 640), pad=6, step=32), (88, 39, 64, 32))
+
+    def test_stays_inside_frame(self) -> None:
+        x, y, w, h = detect._crop_rect((630, 0, 10, 10), (480, 640), pad=6, step=32)
+        self.assertEqual((w, h), (32, 32))
+        self.assertEqual((x + w, y), (640, 0))
+
+    def test_clamps_to_small_frame(self) -> None:
+        self.assertEqual(detect._crop_rect((0, 0, 20, 10), (20, 30), pad=6, step=32), (0, 0, 30, 20))
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class MatchTemplateTests(unittest.TestCase):
+    def test_miss_reports_real_correlation(self) -> None:
+        rng = np.random.default_rng(1)
+        image = rng.integers(0, 256, size=(240, 320), dtype=np.uint8)
+        tpl = rng.integers(0, 256, size=(48, 48), dtype=np.uint8)
+        res = detect._match_template(image, tpl, threshold=0.95)
+        self.assertEqual(res.shape, (240 - 48 + 1, 320 - 48 + 1))
+        self.assertGreater(float(res.max()), -1.0)
+        self.assertLess(float(res.max()), 0.95)
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class DeriveHitboxTests(unittest.TestCase):
+    def test_hitbox_below_word(self) -> None:
+        self.assertEqual(detect.derive_hitbox_from_word((100, 50, 80, 20)), (104, 91, 72, 14))
+
+    def test_returns_ints_for_numpy_input(self) -> None:
+        box = detect.derive_hitbox_from_word(tuple(np.array([10, 10, 5, 5])))
+        self.assertTrue(all(type(v) is int for v in box))
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class FrameCacheTests(unittest.TestCase):
+    def test_threads_share_one_computation(self) -> None:
+        cache = detect._FrameCache()
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return np.ones((4, 4), dtype=np.uint8)
+
+        results = []
+        worker = threading.Thread(target=lambda: results.append(cache.get(frame, "gray", compute)))
+        worker.start()
+        started.wait(5)
+        waiter = threading.Thread(target=lambda: results.append(cache.get(frame, "gray", compute)))
+        waiter.start()
+        release.set()
+        worker.join(5)
+        waiter.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertIs(results[0], results[1])
+
+    def test_failed_compute_is_retried(self) -> None:
+        cache = detect._FrameCache()
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            cache.get(frame, "gray", lambda: (_ for _ in ()).throw(ValueError()))
+        out = cache.get(frame, "gray", lambda: np.ones((4, 4), dtype=np.uint8))
+        self.assertEqual(int(out.sum()), 16)
+
+    def test_new_frame_with_changed_pixels_is_recomputed(self) -> None:
+        cache = detect._FrameCache()
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        cache.get(frame, "gray", lambda: np.zeros((4, 4), dtype=np.uint8))
+        changed = frame.copy()
+        changed[0, 0] = 255
+        out = cache.get(changed, "gray", lambda: np.ones((4, 4), dtype=np.uint8))
+        self.assertEqual(int(out.sum()), 16)
+
+    def test_reused_id_is_not_a_hit(self) -> None:
+        cache = detect._FrameCache()
+        first = np.zeros((4, 4, 3), dtype=np.uint8)
+        second = np.zeros((4, 4, 3), dtype=np.uint8)
+        # Every array gets the same id, as a freed frame's id may be reused.
+        with mock.patch.object(detect, "id", create=True, return_value=1):
+            cache.get(first, "gray", lambda: np.zeros((4, 4), dtype=np.uint8))
+            out = cache.get(second, "gray", lambda: np.ones((4, 4), dtype=np.uint8))
+        self.assertEqual(int(out.sum()), 16)
+
+
+def _patch_result_cache(test: unittest.TestCase) -> None:
+    # Result caches are only enabled with xxhash; the blake2b digest is exact too.
+    patcher = mock.patch.object(detect, "_RESULT_CACHE", True)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class WordResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _patch_result_cache(self)
+        self.calls = []
+        for name, value in (
+            ("_OCR_PARALLEL", False),
+            ("configure_tesseract", mock.Mock()),
+            ("_image_to_data", lambda img, whitelist, oem=None: self.calls.append(img.shape)),
+        ):
+            patcher = mock.patch.object(detect, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.detector = detect.WordDetector()
+        self.frame = np.zeros((40, 60, 3), dtype=np.uint8)
+
+    def test_same_content_is_a_hit(self) -> None:
+        self.detector.detect_multi(self.frame, "attack")
+        self.detector.detect_multi(self.frame.copy(), "attack")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_changed_frame_is_a_miss(self) -> None:
+        self.detector.detect_multi(self.frame, "attack")
+        changed = self.frame.copy()
+        changed[20, 30] = 200
+        self.detector.detect_multi(changed, "attack")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_change_outside_roi_is_a_hit(self) -> None:
+        roi = (0, 0, 30, 20)
+        self.detector.detect_multi(self.frame, "attack", roi_xywh=roi)
+        changed = self.frame.copy()
+        changed[30, 50] = 200
+        self.detector.detect_multi(changed, "attack", roi_xywh=roi)
+        changed[5, 5] = 200
+        self.detector.detect_multi(changed.copy(), "attack", roi_xywh=roi)
+        self.assertEqual(len(self.calls), 2)
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class TemplateResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _patch_result_cache(self)
+        self.calls = []
+
+        def fake(bgr, template, threshold, max_instances, roi_xywh, k):
+            self.calls.append(template)
+            return [], []
+
+        for name, value in (("_template_results", OrderedDict()), ("_detect_template_multi", fake)):
+            patcher = mock.patch.object(detect, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.frame = np.zeros((40, 60, 3), dtype=np.uint8)
+        self.template = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def test_same_region_is_a_hit(self) -> None:
+        detect.detect_template_multi(self.frame, self.template)
+        detect.detect_template_multi(self.frame.copy(), self.template)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_changed_region_is_a_miss(self) -> None:
+        roi = (0, 0, 30, 20)
+        detect.detect_template_multi(self.frame, self.template, roi_xywh=roi)
+        changed = self.frame.copy()
+        changed[30, 50] = 200  # outside the ROI
+        detect.detect_template_multi(changed, self.template, roi_xywh=roi)
+        changed[5, 5] = 200
+        detect.detect_template_multi(changed, self.template, roi_xywh=roi)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_other_template_with_reused_id_is_a_miss(self) -> None:
+        other = self.template.copy()
+        with mock.patch.object(detect, "id", create=True, return_value=1):
+            detect.detect_template_multi(self.frame, self.template)
+            detect.detect_template_multi(self.frame, other)
+        self.assertEqual(len(self.calls), 2)
+        self.assertIs(self.calls[1], other)
+
+
+@unittest.skipIf(detect is None, "vision dependencies not installed")
+class ConfigureTesseractTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "tesseract.exe")
+        open(self.path, "wb").close()
+        cmd = detect.pytesseract.pytesseract
+        for name, value in (("_tess_configured_for", None), ("_tess_install", None)):
+            patcher = mock.patch.object(detect, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(cmd, "tesseract_cmd", cmd.tesseract_cmd)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("TESSERACT_PATH", None)
+
+    def test_repeat_calls_keep_generation_and_cache(self) -> None:
+        detect.configure_tesseract(self.path)
+        generation = detect._tess_generation
+        key = ("probe",)
+        detect._ocr_cache[key] = {}
+        self.addCleanup(detect._ocr_cache.pop, key, None)
+        # Per-frame controller call, then the detectors' argument-less call,
+        # with a differently spelled path to the same binary in between.
+        with mock.patch.object(detect.shutil, "which", return_value=os.path.relpath(self.path)):
+            for _ in range(3):
+                detect.configure_tesseract(self.path)
+                detect.configure_tesseract()
+                detect.configure_tesseract(os.path.relpath(self.path))
+        self.assertEqual(detect._tess_generation, generation)
+        self.assertIn(key, detect._ocr_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
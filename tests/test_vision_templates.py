@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import cv2
+    import numpy as np
+    from bsbot.vision import templates
+except ImportError:  # OpenCV not installed
+    templates = None
+
+
+@unittest.skipIf(templates is None, "vision dependencies not installed")
+class LoadTemplateTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "attack.png")
+
+    def _write(self, value: int) -> None:
+        cv2.imwrite(self.path, np.full((8, 8, 3), value, dtype=np.uint8))
+        # Same size on disk; force a visible mtime change on coarse filesystems.
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged_file_returns_same_array(self) -> None:
+        self._write(10)
+        self.assertIs(templates.load_template(self.path), templates.load_template(self.path))
+
+    def test_rewritten_file_is_reloaded(self) -> None:
+        self._write(10)
+        first = templates.load_template(self.path)
+        self._write(200)
+        second = templates.load_template(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(int(second[0, 0, 0]), 200)
+        self.assertEqual(int(first[0, 0, 0]), 10)
+
+    def test_missing_file(self) -> None:
+        self.assertIsNone(templates.load_template(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
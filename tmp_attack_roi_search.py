@@ -8,18 +8,34 @@ Run with the project virtual environment, e.g.
 
 from __future__ import annotations
 
-import itertools
-from typing import Dict, List, Tuple
+import inspect
+from typing import Dict, List
 
 import cv2
 import numpy as np
 
-from bsbot.vision.detect import detect_template_multi
-
+from bsbot.vision.detect import _EDGE_PASS_MARGIN, _PEAK_KERNEL, _nms, detect_template_multi
 
 SCREENSHOT_PATH = "assets/screenshots/screenshot_without_minimap_wendigo_attackButton.png"
 TEMPLATE_PATH = "assets/templates/attack_button.png"
 
+# Same passes as detect_template_multi: grayscale correlation, plus edges when
+# the grayscale peak is not clearly above the threshold, then NMS.
+MATCH_THRESHOLD = 0.7
+MIN_SCORE = 0.85
+MAX_INSTANCES = inspect.signature(detect_template_multi).parameters["max_instances"].default
+
+
+def _peaks(sub: np.ndarray, th: int, tw: int):
+    """Above-threshold 3x3 local maxima of a score slice as boxes and scores."""
+    above = sub >= MATCH_THRESHOLD
+    if not above.any():
+        return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32)
+    above &= sub >= cv2.dilate(sub, _PEAK_KERNEL)
+    ys, xs = np.nonzero(above)
+    boxes = np.stack([xs, ys, np.full_like(xs, tw), np.full_like(xs, th)], axis=1).astype(np.int32)
+    return boxes, sub[above].astype(np.float32, copy=False)
+
 
 def main() -> None:
     frame = cv2.imread(SCREENSHOT_PATH, cv2.IMREAD_COLOR)
@@ -30,6 +46,15 @@ def main() -> None:
         raise SystemExit(f"Failed to load template: {TEMPLATE_PATH}")
 
     height, width = frame.shape[:2]
+    th, tw = template.shape[:2]
+
+    # Correlate once over the whole frame. A match lies inside an ROI exactly
+    # when its top-left is in the ROI's slice of the score map, so every ROI
+    # candidate below is a slice and a max instead of its own matchTemplate.
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    tpl_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+    gray_scores = cv2.matchTemplate(gray, tpl_gray, cv2.TM_CCOEFF_NORMED)
+    edge_scores = cv2.matchTemplate(cv2.Canny(gray, 80, 160), cv2.Canny(tpl_gray, 80, 160), cv2.TM_CCOEFF_NORMED)
 
     rx_values = np.linspace(0.35, 0.55, 11)  # normalised x origin
     ry_values = np.linspace(0.25, 0.45, 11)  # normalised y origin
@@ -38,27 +63,35 @@ def main() -> None:
 
     results: List[Dict[str, object]] = []
 
-    for rx, ry, rw, rh in itertools.product(rx_values, ry_values, rw_values, rh_values):
-        x = int(round(rx * width))
-        y = int(round(ry * height))
-        w = int(round(rw * width))
-        h = int(round(rh * height))
-
-        if w <= 0 or h <= 0:
+    # Every (rx, ry, rw, rh) combination as flat arrays; boxes that are empty,
+    # smaller than the template or past the frame edge are dropped in one mask
+    # so only the survivors are scored below.
+    grid = np.meshgrid(rx_values, ry_values, rw_values, rh_values, indexing="ij")
+    RX, RY, RW, RH = (g.ravel() for g in grid)
+    X = np.round(RX * width).astype(np.int64)
+    Y = np.round(RY * height).astype(np.int64)
+    W = np.round(RW * width).astype(np.int64)
+    H = np.round(RH * height).astype(np.int64)
+    valid = (W >= max(tw, 1)) & (H >= max(th, 1)) & (X + W <= width) & (Y + H <= height)
+
+    for i in np.flatnonzero(valid):
+        rx, ry, rw, rh = float(RX[i]), float(RY[i]), float(RW[i]), float(RH[i])
+        x, y, w, h = int(X[i]), int(Y[i]), int(W[i]), int(H[i])
+
+        window = (slice(y, y + h - th + 1), slice(x, x + w - tw + 1))
+        sub = gray_scores[window]
+        cand_boxes, cand_scores = _peaks(sub, th, tw)
+        if float(sub.max()) < MATCH_THRESHOLD + _EDGE_PASS_MARGIN:
+            edge_boxes, edge_scores_roi = _peaks(edge_scores[window], th, tw)
+            cand_boxes = np.concatenate([cand_boxes, edge_boxes])
+            cand_scores = np.concatenate([cand_scores, edge_scores_roi])
+        if not cand_scores.size:
             continue
-        if w < template.shape[1] or h < template.shape[0]:
-            continue
-        if x + w > width or y + h > height:
-            continue
-
-        roi = frame[y : y + h, x : x + w]
-        boxes, scores = detect_template_multi(roi, template, threshold=0.7)
-        if not scores:
-            continue
-
-        score = float(max(scores))
-        if score < 0.85:
+        keep = _nms(cand_boxes, cand_scores, iou_thresh=0.5)[:MAX_INSTANCES]
+        score = float(cand_scores[keep].max())
+        if score < MIN_SCORE:
             continue
+        boxes = [tuple(b) for b in cand_boxes[keep].tolist()]  # ROI-relative, as before
 
         results.append(
             {